@@ -6,9 +6,14 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import EbusGlowWormCoordinator as Coordinator
+from .const import DATA_SCHEDULER, DOMAIN, STORAGE_VERSION
+from .coordinator import EbusGlowWormCoordinator as Coordinator, storage_key
+from .scheduler import EbusGlowWormScheduler
+from .services import async_setup_services
 
 _PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
@@ -21,6 +26,14 @@ type EbusGlowWormConfigEntry = ConfigEntry[Coordinator]
 
 _LOGGER = logging.getLogger("EbusGW_" + __name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services of the integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: EbusGlowWormConfigEntry
@@ -29,19 +42,73 @@ async def async_setup_entry(
     _LOGGER.debug("async_setup_entry")
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = Coordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = EbusGlowWormScheduler(hass)
+
+    coordinator = Coordinator(hass, entry, scheduler)
+    scheduler.add(coordinator)
+    # With a saved snapshot the entities start from it and the live refresh
+    # runs in the background, so a slow gateway does not hold up startup.
+    warm = await coordinator.async_load_snapshot()
+    if not warm:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await _async_remove_from_scheduler(hass, coordinator)
+            raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
+    if warm:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_{entry.entry_id}_refresh"
+        )
+    entry.async_create_background_task(
+        hass, coordinator.async_stream(), f"{DOMAIN}_{entry.entry_id}_stream"
+    )
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_load_heat_loss(),
+        f"{DOMAIN}_{entry.entry_id}_heat_loss",
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: EbusGlowWormConfigEntry
+) -> None:
+    """Reload the entry so new options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: EbusGlowWormConfigEntry
 ) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("async_unload_entry")
-    return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, _PLATFORMS
+    ):
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        await _async_remove_from_scheduler(hass, coordinator)
+    return unload_ok
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: EbusGlowWormConfigEntry
+) -> None:
+    """Delete the warm-start snapshot of a removed entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry.entry_id)).async_remove()
+
+
+async def _async_remove_from_scheduler(
+    hass: HomeAssistant, coordinator: Coordinator
+) -> None:
+    """Drop the shared scheduler once its last coordinator is gone."""
+    if await coordinator.scheduler.async_remove(coordinator):
+        hass.data.pop(DATA_SCHEDULER, None)
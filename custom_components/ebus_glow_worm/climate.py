@@ -15,11 +15,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import EbusGlowWormCoordinator
+from .entity import EbusGlowWormEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,7 +36,7 @@ async def async_setup_entry(
     async_add_entities([EbusBoilerClimate(coordinator, entry)])
 
 
-class EbusBoilerClimate(CoordinatorEntity[EbusGlowWormCoordinator], ClimateEntity):
+class EbusBoilerClimate(EbusGlowWormEntity, ClimateEntity):
     """Representation of the Glow-worm boiler as a climate entity."""
 
     _attr_has_entity_name = True
@@ -47,6 +46,9 @@ class EbusBoilerClimate(CoordinatorEntity[EbusGlowWormCoordinator], ClimateEntit
     _attr_hvac_modes = [HVACMode.HEAT, HVACMode.OFF]
     _attr_min_temp = 10.0
     _attr_max_temp = 30.0
+    _data_keys = frozenset(
+        {"inside_temp", "target_temperature", "mode", "gas_active"}
+    )
 
     def __init__(
         self, coordinator: EbusGlowWormCoordinator, entry: ConfigEntry
@@ -65,32 +67,14 @@ class EbusBoilerClimate(CoordinatorEntity[EbusGlowWormCoordinator], ClimateEntit
             | ClimateEntityFeature.TURN_OFF
         )
 
-    @property
-    def current_temperature(self) -> StateType:
-        """Return the current temperature."""
-        return self.coordinator.data.get("current_temperature")
-
-    @property
-    def target_temperature(self) -> StateType:
-        """Return the temperature we try to reach."""
-        return self.coordinator.data.get("target_temperature")
-
-    @property
-    def hvac_mode(self) -> HVACMode:
-        """Return current operation mode."""
-        return (
-            HVACMode.HEAT
-            if self.coordinator.data.get("heating_active")
-            else HVACMode.OFF
-        )
-
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
         await self.coordinator.async_set_target_temperature(temperature)
-        await self.coordinator.async_request_refresh()
+        if self.coordinator.heat_curve is not None:
+            self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set HVAC mode."""
@@ -98,37 +82,30 @@ class EbusBoilerClimate(CoordinatorEntity[EbusGlowWormCoordinator], ClimateEntit
             await self.coordinator.async_set_heating(True)
         elif hvac_mode == HVACMode.OFF:
             await self.coordinator.async_set_heating(False)
-        await self.coordinator.async_request_refresh()
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        if "inside_temp" in self.coordinator.data:
-            return self.coordinator.data["inside_temp"]
-        return None
+        return self.coordinator.state.inside_temp
 
     @property
     def target_temperature(self) -> float | None:
-        """Return the target temperature."""
-        if "target_temperature" in self.coordinator.data:
-            return self.coordinator.data["target_temperature"]
-        return None
+        """Return the target temperature, the comfort one under the heat curve."""
+        if self.coordinator.heat_curve is not None:
+            return self.coordinator.heat_curve.comfort
+        return self.coordinator.state.target_temperature
 
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current HVAC mode."""
-        if "mode" in self.coordinator.data:
-            mode = self.coordinator.data["mode"]
-            if mode == "off":
-                return HVACMode.OFF
-            elif mode == "heating":
-                return HVACMode.HEAT
+        if self.coordinator.state.mode == "heating":
+            return HVACMode.HEAT
         return HVACMode.OFF
 
     @property
     def hvac_action(self) -> HVACAction | None:
         """Return the current HVAC action."""
-        if "gas_active" in self.coordinator.data:
-            active = self.coordinator.data["gas_active"]
-            return HVACAction.HEATING if active else HVACAction.IDLE
-        return None
+        active = self.coordinator.state.gas_active
+        if active is None:
+            return None
+        return HVACAction.HEATING if active else HVACAction.IDLE
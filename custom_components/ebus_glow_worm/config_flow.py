@@ -8,12 +8,35 @@ from typing import Any
 import aiohttp
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    CONF_CURVE_SHIFT,
+    CONF_CURVE_SLOPE,
+    CONF_HEAT_CURVE,
+    CONF_HISTORY,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_STALE_EXPIRY,
+    DEFAULT_CURVE_SHIFT,
+    DEFAULT_CURVE_SLOPE,
+    DEFAULT_HEAT_CURVE,
+    DEFAULT_HISTORY,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_STALE_EXPIRY,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +48,29 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_MIN_INTERVAL, default=DEFAULT_MIN_INTERVAL): vol.All(
+            int, vol.Range(min=5, max=3600)
+        ),
+        vol.Required(CONF_MAX_INTERVAL, default=DEFAULT_MAX_INTERVAL): vol.All(
+            int, vol.Range(min=5, max=3600)
+        ),
+        vol.Required(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): bool,
+        vol.Required(CONF_STALE_EXPIRY, default=DEFAULT_STALE_EXPIRY): vol.All(
+            int, vol.Range(min=0, max=86400)
+        ),
+        vol.Required(CONF_HISTORY, default=DEFAULT_HISTORY): bool,
+        vol.Required(CONF_HEAT_CURVE, default=DEFAULT_HEAT_CURVE): bool,
+        vol.Required(CONF_CURVE_SLOPE, default=DEFAULT_CURVE_SLOPE): vol.All(
+            vol.Coerce(float), vol.Range(min=0.2, max=4.0)
+        ),
+        vol.Required(CONF_CURVE_SHIFT, default=DEFAULT_CURVE_SHIFT): vol.All(
+            vol.Coerce(float), vol.Range(min=-10, max=10)
+        ),
+    }
+)
+
 
 class EbusGlowWormConfigFlow:
     """Config flow for the Ebus Glow Worm integration."""
@@ -82,6 +128,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Return the options flow."""
+        return EbusGlowWormOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -105,6 +157,29 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class EbusGlowWormOptionsFlow(OptionsFlow):
+    """Handle options for Ebus Glow Worm."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling bounds and optimistic updates."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
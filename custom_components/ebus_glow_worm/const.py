@@ -5,6 +5,34 @@ from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 
 DOMAIN = "ebus_boiler_glow_worm"
 
+# Adaptive polling: the interval drops to the minimum while the boiler is
+# active and doubles up to the maximum while the payload does not change.
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_OPTIMISTIC = "optimistic"
+CONF_STALE_EXPIRY = "stale_expiry"
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_MIN_INTERVAL = 15
+DEFAULT_MAX_INTERVAL = 300
+FLOW_TEMP_STEP = 1.0
+
+# Fast-changing fields are polled on their own with /get?fields=, and the
+# whole payload, with the slow counters and configuration, only every
+# COLD_REFRESH_INTERVAL seconds.
+HOT_FIELDS = (
+    "flow_temp",
+    "return_temp",
+    "desired_flow_temp",
+    "inside_temp",
+    "power",
+    "gas_active",
+    "pump_active",
+    "stat.hwc_demand",
+)
+COLD_REFRESH_INTERVAL = 600
+
+# scale and offset are applied to the raw value when the payload is parsed.
+# The gateway already reports temperatures in degrees Celsius.
 PARAMETERS_MAP = {
     0: {
         "param_id": "mode",
@@ -22,7 +50,7 @@ PARAMETERS_MAP = {
         "unit": UnitOfTemperature.CELSIUS,
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
-        "scale": 0.1,
+        "scale": 1,
         "offset": 0,
         "description": "Room temperature",
     },
@@ -32,7 +60,7 @@ PARAMETERS_MAP = {
         "unit": UnitOfTemperature.CELSIUS,
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
-        "scale": 0.1,
+        "scale": 1,
         "offset": 0,
         "description": "Target room temperature",
     },
@@ -42,7 +70,7 @@ PARAMETERS_MAP = {
         "unit": UnitOfTemperature.CELSIUS,
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
-        "scale": 0.1,
+        "scale": 1,
         "offset": 0,
         "description": "Outside temperature",
     },
@@ -52,7 +80,7 @@ PARAMETERS_MAP = {
         "unit": UnitOfTemperature.CELSIUS,
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
-        "scale": 0.1,
+        "scale": 1,
         "offset": 0,
         "description": "Flow temperature",
     },
@@ -62,7 +90,7 @@ PARAMETERS_MAP = {
         "unit": UnitOfTemperature.CELSIUS,
         "device_class": SensorDeviceClass.TEMPERATURE,
         "state_class": SensorStateClass.MEASUREMENT,
-        "scale": 0.1,
+        "scale": 1,
         "offset": 0,
         "description": "Return temperature",
     },
@@ -87,3 +115,105 @@ PARAMETERS_MAP = {
         "description": "Hot water target temperature",
     },
 }
+
+# Keep-alive pool used for all requests to the gateway.  The idle timeout
+# is longer than the poll interval so that consecutive polls reuse a socket.
+DEFAULT_POOL_SIZE = 2
+DEFAULT_IDLE_TIMEOUT = 90
+REQUEST_TIMEOUT = 5
+
+# Polls of all configured gateways are at least POLL_SPACING seconds apart
+# and no more than MAX_CONCURRENT_POLLS run at the same time.
+POLL_SPACING = 2.0
+MAX_CONCURRENT_POLLS = 2
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# Failed requests are retried with full-jitter exponential backoff.  After
+# BREAKER_THRESHOLD consecutive failures requests are refused for
+# BREAKER_RESET_TIMEOUT seconds, then a /check probe decides whether to
+# resume.  Meanwhile the last good payload is served for DEFAULT_STALE_EXPIRY
+# seconds before the entities become unavailable.
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 4.0
+BREAKER_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 60
+DEFAULT_STALE_EXPIRY = 600
+
+# Burner output at 100 % modulation in kW, used to turn the power reading
+# into energy, and the longest interval without a sample that is still
+# integrated.  A quiet event stream only brings a sample with the resync
+# poll every STREAM_RESYNC_INTERVAL seconds, so the gap limit is twice that.
+BOILER_MAX_POWER = 24.0
+ENERGY_MAX_GAP = 1800
+
+# Optional columnar history of the readings, appended in chunks of
+# HISTORY_CHUNK_ROWS samples to files rotated at HISTORY_FILE_SIZE bytes,
+# with the oldest files removed beyond HISTORY_MAX_SIZE bytes.
+CONF_HISTORY = "history"
+DEFAULT_HISTORY = False
+HISTORY_CHUNK_ROWS = 360
+HISTORY_FILE_SIZE = 4 * 1024 * 1024
+HISTORY_MAX_SIZE = 64 * 1024 * 1024
+
+# Optional weather compensation: the integration follows its own heat curve
+# by adjusting the room setpoint.  CURVE_ROOM_GAIN raises the wanted flow by
+# that many kelvin per kelvin the room is too cold, and CURVE_FLOW_GAIN is
+# how far the boiler's desired flow moves per kelvin of room setpoint.  A
+# new setpoint is written once it is more than CURVE_HYSTERESIS kelvin away
+# from the current one, at most once per CURVE_SETTLE_TIME seconds, and at
+# most CURVE_MAX_OFFSET kelvin from the comfort temperature.
+CONF_HEAT_CURVE = "heat_curve"
+CONF_CURVE_SLOPE = "curve_slope"
+CONF_CURVE_SHIFT = "curve_shift"
+DEFAULT_HEAT_CURVE = False
+DEFAULT_CURVE_SLOPE = 2.0
+DEFAULT_CURVE_SHIFT = 0.0
+DEFAULT_COMFORT_TEMP = 20.0
+CURVE_MIN_FLOW = 25.0
+CURVE_MAX_FLOW = 75.0
+CURVE_ROOM_GAIN = 2.0
+CURVE_FLOW_GAIN = 3.5
+CURVE_HYSTERESIS = 0.5
+CURVE_MAX_OFFSET = 3.0
+CURVE_SETTLE_TIME = 900
+
+# The heat-loss fit averages the readings over HEAT_LOSS_STEP seconds and
+# fits the last HEAT_LOSS_WINDOW bins, 30 days, once at least
+# HEAT_LOSS_MIN_ROWS pairs of consecutive bins, a day, are available.
+HEAT_LOSS_STEP = 900
+HEAT_LOSS_WINDOW = 30 * 96
+HEAT_LOSS_MIN_ROWS = 96
+
+# The last good payload is saved so entities can start from it after a
+# restart while the gateway is still being reached.
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+SERVICE_SET_VALUES = "set_values"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_VALUES = "values"
+SERVICE_EXPORT_HISTORY = "export_history"
+ATTR_START = "start"
+ATTR_END = "end"
+
+# Server-sent events stream published by gateways that support push updates.
+# While the stream is up the coordinator only polls to resync occasionally.
+STREAM_PATH = "/events"
+STREAM_READ_TIMEOUT = 90
+STREAM_BACKOFF_MIN = 1
+STREAM_BACKOFF_MAX = 300
+STREAM_RESYNC_INTERVAL = 900
+
+# Number of recent samples kept per key for the trend sensors.
+TREND_WINDOW = 120
+
+# Setpoint changes arriving within this many seconds of each other are
+# merged into a single /set request.
+WRITE_DEBOUNCE = 1.0
+
+# In optimistic mode commanded values are shown immediately and checked
+# against the boiler VERIFY_DELAY seconds later, giving the gateway time to
+# pass the write on over eBus.  Writes within the delay share one read.
+DEFAULT_OPTIMISTIC = True
+VERIFY_DELAY = 3
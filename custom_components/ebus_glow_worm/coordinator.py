@@ -1,168 +1,936 @@
 """Coordinator for the eBus Glow Worm boiler integration."""
 
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
 import logging
-from typing import Any
+import random
+from datetime import datetime
+from pathlib import Path
+import time
+from typing import Any, NamedTuple, TypeVar
 
-import requests
+import aiohttp
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     HomeAssistant,
     UpdateFailed,
     timedelta,
 )
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import DOMAIN, PARAMETERS_MAP
+from .const import (
+    COLD_REFRESH_INTERVAL,
+    CONF_CURVE_SHIFT,
+    CONF_CURVE_SLOPE,
+    CONF_HEAT_CURVE,
+    CONF_HISTORY,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_OPTIMISTIC,
+    CONF_STALE_EXPIRY,
+    DEFAULT_COMFORT_TEMP,
+    DEFAULT_CURVE_SHIFT,
+    DEFAULT_CURVE_SLOPE,
+    DEFAULT_HEAT_CURVE,
+    DEFAULT_HISTORY,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_STALE_EXPIRY,
+    DOMAIN,
+    FLOW_TEMP_STEP,
+    HEAT_LOSS_STEP,
+    HEAT_LOSS_WINDOW,
+    HOT_FIELDS,
+    PARAMETERS_MAP,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STREAM_BACKOFF_MAX,
+    STREAM_BACKOFF_MIN,
+    STREAM_PATH,
+    STREAM_RESYNC_INTERVAL,
+    VERIFY_DELAY,
+    WRITE_DEBOUNCE,
+)
+from .energy import EnergyAccountant
+from .heatcurve import HeatCurveController
+from .heatloss import HeatLossModel
+from .history import HistoryWriter
+from .metrics import percentile
+from .registry import AccessorRegistry, SchemaRegistry
+from .scheduler import EbusGlowWormScheduler
+from .state import EbusBoilerData
+from .transport import GatewayTransport
+from .trends import TrendTracker
 
 _LOGGER = logging.getLogger("EbusGW_" + __name__)
 
+_T = TypeVar("_T")
+
+
+# Keys accepted by async_set_many and how to validate them.  Values of
+# OVERRIDE_KEYS go to /override, everything else is batched into /set.
+WRITABLE_KEYS: dict[str, Any] = {
+    "target_temperature": vol.All(vol.Coerce(float), vol.Range(min=10, max=30)),
+    "mode": vol.In(["heating", "off"]),
+    "hw_target_temp": vol.All(vol.Coerce(int), vol.Range(min=35, max=50)),
+    "gas_active": vol.Boolean(),
+}
+OVERRIDE_KEYS = frozenset({"gas_active"})
+
+
+class WriteResult(NamedTuple):
+    """Outcome of writing one key."""
+
+    success: bool
+    error: str | None = None
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of an entry's warm-start snapshot."""
+    return f"{DOMAIN}.{entry_id}"
+
+
+def merge_update(data: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of data with a partial update applied.
+
+    Nested dicts such as ``stat`` and ``boiler`` are merged key by key.
+    """
+    merged = dict(data)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_update(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def select_fields(data: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Return the part of a payload named by fields such as ``stat.hwc_demand``."""
+    selected: dict[str, Any] = {}
+    for field in fields:
+        section, _, key = field.rpartition(".")
+        source = data.get(section) if section else data
+        if isinstance(source, dict) and key in source:
+            target = selected.setdefault(section, {}) if section else selected
+            target[key] = source[key]
+    return selected
+
+
+def diff_keys(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    """Return the leaf keys whose value differs between two payloads.
+
+    Keys of the nested ``stat`` and ``boiler`` dicts are reported by their
+    own name, which is how the entities address them.
+    """
+    changed: set[str] = set()
+    for key in old.keys() | new.keys():
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) or isinstance(new_value, dict):
+            changed |= diff_keys(
+                old_value if isinstance(old_value, dict) else {},
+                new_value if isinstance(new_value, dict) else {},
+            )
+        else:
+            changed.add(key)
+    return changed
+
+
+def values_match(commanded: Any, reported: Any) -> bool:
+    """Return True if the boiler reports the value that was commanded."""
+    if isinstance(commanded, (int, float)) and isinstance(reported, (int, float)):
+        return abs(commanded - reported) < 0.05
+    return commanded == reported
+
+
+def is_active(data: dict[str, Any]) -> bool:
+    """Return True while the burner, pump or hot water demand is on."""
+    return (
+        bool(data.get("gas_active"))
+        or bool(data.get("pump_active"))
+        or data.get("stat", {}).get("hwc_demand") == "yes"
+    )
+
 
 class EbusGlowWormCoordinator(DataUpdateCoordinator):
     """Ebus Glow Worm coordinator class."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        scheduler: EbusGlowWormScheduler,
+    ) -> None:
         """Initialize."""
 
         self.entry = entry
         self.host = entry.data[CONF_HOST]
         self.port = entry.data[CONF_PORT]
         self.password = entry.data[CONF_PASSWORD]
+        self.scheduler = scheduler
+        self.transport = GatewayTransport(
+            f"http://{self.host}:{self.port}", scheduler.pool
+        )
+        options = entry.options
+        self.min_interval = options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        self.max_interval = options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        self.poll_interval = timedelta(seconds=self._clamp(DEFAULT_POLL_INTERVAL))
+        self.optimistic = options.get(CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC)
+        self.stale_expiry = options.get(CONF_STALE_EXPIRY, DEFAULT_STALE_EXPIRY)
+        # When the gateway last answered, and whether the data is older.
+        self.last_good_update: datetime | None = None
+        self.stale = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry.entry_id)
+        )
+        self._save_pending = False
+        self.streaming = False
+        self.changed_keys: set[str] = set()
+        # Incremented by entities that skip an unchanged state write.
+        self.suppressed_writes = 0
+        self.last_suppressed_writes = 0
+        self._notified_data: dict[str, Any] = {}
+        # Typed view of the payload, parsed once per update for the entities.
+        self.state = EbusBoilerData.from_dict({})
+        self.accessors = AccessorRegistry()
+        self.schema = SchemaRegistry()
+        self.trends = TrendTracker()
+        self.energy = EnergyAccountant()
+        self.heat_loss = HeatLossModel()
+        self.history: HistoryWriter | None = None
+        if options.get(CONF_HISTORY, DEFAULT_HISTORY):
+            self.history = HistoryWriter(
+                Path(hass.config.path(DOMAIN, "history", entry.entry_id))
+            )
+        self.heat_curve: HeatCurveController | None = None
+        if options.get(CONF_HEAT_CURVE, DEFAULT_HEAT_CURVE):
+            self.heat_curve = HeatCurveController(
+                options.get(CONF_CURVE_SLOPE, DEFAULT_CURVE_SLOPE),
+                options.get(CONF_CURVE_SHIFT, DEFAULT_CURVE_SHIFT),
+                DEFAULT_COMFORT_TEMP,
+            )
+        # Last payload fetched from the gateway and its cache validators.
+        self._payload: dict[str, Any] | None = None
+        self._body_hash: int | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Hot keys are polled on their own between full (cold) fetches.
+        self.partial_fetch = True
+        self._cold_due = 0.0
+        self.hot_polls = 0
+        self.cold_polls = 0
+        # Requests in flight by their method, path and body, shared by callers.
+        self._in_flight: dict[str, asyncio.Future[Any]] = {}
+        self.requests_merged = 0
+        self.writes_deduplicated = 0
+        # Pending /set body, flushed once the setpoints stop changing.
+        self._pending_writes: dict[str, Any] = {}
+        self._write_waiters: list[asyncio.Future[None]] = []
+        self._unsub_write: CALLBACK_TYPE | None = None
+        self.writes_sent = 0
+        self.writes_coalesced = 0
+        # Optimistic values awaiting verification and the values they replaced.
+        self._unverified: dict[str, Any] = {}
+        self._previous: dict[str, Any] = {}
+        self._verifier = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=VERIFY_DELAY,
+            immediate=False,
+            function=self._async_verify_writes,
+        )
+        self.writes_rejected = 0
+        self.metrics: dict[str, Any] = {}
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),
+            update_interval=self.poll_interval,
+            always_update=False,
         )
         self.entry = entry
 
+    @callback
+    def async_update_listeners(self) -> None:
+        """Work out which keys changed before notifying the entities."""
+        data = self.data or {}
+        self.changed_keys = diff_keys(self._notified_data, data)
+        if data is not self._notified_data:
+            self.state = EbusBoilerData.from_dict(data)
+            self.accessors.evaluate(self.state)
+            self.schema.observe(data)
+            self.trends.add(time.monotonic(), self.state)
+            self.energy.add(dt_util.now(), self.state)
+            self._async_schedule_save()
+            self.heat_loss.add_state(time.time(), self.state)
+            self._async_record_history()
+            self._async_follow_heat_curve()
+        self._notified_data = data
+        self.last_suppressed_writes = self.suppressed_writes
+        self.suppressed_writes = 0
+        # Computed once per update rather than once per diagnostic sensor.
+        self.metrics = self.collect_metrics()
+        super().async_update_listeners()
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the boiler."""
+        queued = time.monotonic()
         try:
-            return await self.hass.async_add_executor_job(self._fetch_data)
+            async with self.scheduler.async_poll_slot():
+                self.transport.metrics.slot_wait.append(
+                    (time.monotonic() - queued) * 1000
+                )
+                data = await self._async_poll()
         except Exception as err:
+            if self._serve_stale():
+                self._async_notify_unchanged()
+                return self.data
+            if not self.last_update_success:
+                # The base class only notifies when the updates start failing.
+                self._async_notify_unchanged()
             raise UpdateFailed(f"Error communicating with boiler: {err}") from err
+        self._mark_fresh()
+        if data is self.data:
+            # Unchanged payloads still count as samples.
+            self.energy.seen(dt_util.now())
+            self._async_schedule_save()
+            self.heat_loss.add_state(time.time(), self.state)
+            self._async_record_history()
+            self._async_notify_unchanged()
+        self._adapt_poll_interval(self.data or {}, data)
+        return data
 
-    def _fetch_data(self) -> dict[str, Any]:
-        """Fetch data from the boiler."""
-        # load json from host:port
+    @callback
+    def _async_notify_unchanged(self) -> None:
+        """Notify the entities of a refresh that brought no new payload.
+
+        With ``always_update=False`` the base class only notifies on a new
+        payload, which would freeze the diagnostics (poll interval, cache
+        hit ratio, latency) and the energy totals while the boiler idles.
+        The same goes for a failed refresh that serves stale data or
+        follows another failure.  With no changed keys, entities that track
+        payload keys skip their writes, and the others only write a value
+        that moved.  The call is deferred until the refresh has finished,
+        so the interval and success flag it reports are the new ones.
+        """
+        self.hass.loop.call_soon(self.async_update_listeners)
+
+    @callback
+    def _async_record_history(self) -> None:
+        """Append the current state to the history, writing full chunks."""
+        if self.history is None:
+            return
+        self.history.append(time.time(), self.state)
+        if self.history.ready:
+            self.hass.async_add_executor_job(self.history.write)
+
+    @callback
+    def _async_follow_heat_curve(self) -> None:
+        """Write the room setpoint the heat curve asks for, if it moved."""
+        if self.heat_curve is None or self.stale:
+            return
+        if (setpoint := self.heat_curve.propose(time.monotonic(), self.state)) is None:
+            return
+        _LOGGER.debug("Heat curve moves the room setpoint to %s", setpoint)
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_write_heat_curve(setpoint),
+            "ebus_glow_worm heat curve write",
+        )
+
+    async def _async_write_heat_curve(self, setpoint: float) -> None:
+        """Send a setpoint chosen by the heat curve through the write path."""
+        result = (await self.async_set_many({"target_temperature": setpoint}))[
+            "target_temperature"
+        ]
+        if not result.success:
+            _LOGGER.warning("Heat curve could not set %s: %s", setpoint, result.error)
+            self.heat_curve.cancel()
+            return
+        self.heat_curve.commit(time.monotonic())
+
+    async def async_load_heat_loss(self) -> None:
+        """Fit the heat-loss model to the recorded history after a start."""
+        if self.history is None:
+            return
+        model = await self.hass.async_add_executor_job(self._read_heat_loss)
+        if len(model) > len(self.heat_loss):
+            self.heat_loss = model
+            self.async_update_listeners()
+
+    def _read_heat_loss(self) -> HeatLossModel:
+        """Return a heat-loss model fed from the history files."""
+        model = HeatLossModel()
+        since = time.time() - HEAT_LOSS_WINDOW * HEAT_LOSS_STEP
+        for mapped in self.history.mapped(since):
+            model.add_history(mapped, since)
+        return model
+
+    async def async_export_history(
+        self, start: datetime, end: datetime
+    ) -> tuple[Path, int]:
+        """Export the history between two times to a new file.
+
+        Returns the file and the number of rows it holds.
+        """
+        if self.history is None:
+            raise ValueError("History recording is disabled")
+        self.history.seal()
+        target = Path(
+            self.hass.config.path(
+                DOMAIN,
+                "exports",
+                f"{self.entry.entry_id}-{start:%Y%m%d%H%M}-{end:%Y%m%d%H%M}.ebgw",
+            )
+        )
+        rows = await self.hass.async_add_executor_job(
+            self.history.export, start.timestamp(), end.timestamp(), target
+        )
+        return target, rows
+
+    def _serve_stale(self) -> bool:
+        """Return True if the last good data may stand in for a failed poll.
+
+        Keeping the data instead of failing the update keeps the entities
+        available through short outages; they go unavailable once the data
+        is older than the configured expiry.
+        """
+        if self.data is None or self.last_good_update is None:
+            return False
+        age = (dt_util.utcnow() - self.last_good_update).total_seconds()
+        if age >= self.stale_expiry:
+            return False
+        if not self.stale:
+            _LOGGER.warning(
+                "Boiler unreachable, keeping data from %s", self.last_good_update
+            )
+            self.stale = True
+        return True
+
+    def _mark_fresh(self) -> None:
+        """Record that the gateway just delivered data."""
+        if self.stale:
+            _LOGGER.info("Boiler reachable again")
+            self.stale = False
+        self.last_good_update = dt_util.utcnow()
+
+    def _adapt_poll_interval(
+        self, old: dict[str, Any], new: dict[str, Any]
+    ) -> None:
+        """Pick the next poll interval from the boiler's activity."""
+        flow_step = abs((new.get("flow_temp") or 0) - (old.get("flow_temp") or 0))
+        if is_active(new) or (old and flow_step >= FLOW_TEMP_STEP):
+            seconds = self.min_interval
+        elif old == new:
+            seconds = self.poll_interval.total_seconds() * 2
+        else:
+            seconds = DEFAULT_POLL_INTERVAL
+        self.poll_interval = timedelta(seconds=self._clamp(seconds))
+        if not self.streaming:
+            self.update_interval = self.poll_interval
+
+    def _clamp(self, seconds: float) -> float:
+        """Clamp a poll interval to the configured bounds."""
+        return min(max(seconds, self.min_interval), self.max_interval)
+
+    async def _async_poll(self) -> dict[str, Any]:
+        """Fetch the hot keys, or the whole payload when the cold keys are due.
+
+        The hot keys are merged into the current data, so the entities see
+        one payload however its parts were fetched.  Without field selection
+        every poll downloads the whole payload, so all of it is kept.
+        """
+        now = time.monotonic()
+        if self.data is None or now >= self._cold_due or not self.partial_fetch:
+            data = await self._async_fetch_data()
+            self._cold_due = now + COLD_REFRESH_INTERVAL
+            self.cold_polls += 1
+            return data
+        self.hot_polls += 1
+        if (hot := await self._async_fetch_fields(HOT_FIELDS)) is None:
+            return await self._async_fetch_data()
+        if hot == select_fields(self.data, HOT_FIELDS):
+            return self.data
+        return merge_update(self.data, hot)
+
+    async def _async_fetch_fields(
+        self, fields: tuple[str, ...]
+    ) -> dict[str, Any] | None:
+        """Fetch some fields with ``/get?fields=``.
+
+        Returns None if the gateway rejects the filter.  A gateway that
+        ignores it sends the whole payload, which is returned whole so the
+        cold keys it brought are not thrown away.  Either way later polls
+        fall back to plain ``/get``, which can be answered from the
+        conditional request cache.
+        """
+        query = ",".join(fields)
+        try:
+            response = await self._async_single_flight(
+                f"GET /get?fields={query}",
+                lambda: self.transport.async_fetch(
+                    "GET", "/get", params={"fields": query}
+                ),
+            )
+        except aiohttp.ClientResponseError as err:
+            if err.status not in (400, 404, 422):
+                raise
+            _LOGGER.info("Gateway does not support field selection")
+            self.partial_fetch = False
+            return None
+        data = json_loads(response.body)
+        if select_fields(data, fields) != data:
+            _LOGGER.info("Gateway ignores field selection, fetching everything")
+            self.partial_fetch = False
+        return data
+
+    async def _async_single_flight(
+        self, key: str, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Send a request unless an identical one is in flight.
 
-        data = {}
+        Callers arriving while the request runs share its result, so the
+        gateway sees one request however many entities, automations and
+        refreshes ask at the same time.  The request is shielded so one
+        cancelled caller does not cancel it for the others.
+        """
+        if (future := self._in_flight.get(key)) is not None:
+            self.requests_merged += 1
+            return await asyncio.shield(future)
+        future = self._in_flight[key] = asyncio.ensure_future(request())
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the whole payload, sharing a fetch already in flight."""
+        return await self._async_single_flight("GET /get", self._async_fetch_payload)
+
+    async def _async_fetch_payload(self) -> dict[str, Any]:
+        """Fetch data from the boiler.
+
+        The request is conditional when the gateway sent an ETag or
+        Last-Modified header.  On 304, or a body identical to the previous
+        one, the cached payload object is returned without parsing; the
+        coordinator then skips notifying the entities as nothing changed.
+        """
+        headers: dict[str, str] = {}
+        if self._payload is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
         try:
-            response = requests.get(f"http://{self.host}:{self.port}/get", timeout=5)
-            response.raise_for_status()
-            data.update(response.json())
-        except requests.Timeout:
+            response = await self.transport.async_fetch("GET", "/get", headers=headers)
+        except asyncio.TimeoutError:
             _LOGGER.error("Request timed out")
-        except requests.RequestException as err:
+            raise
+        except aiohttp.ClientError as err:
             _LOGGER.error(f"Error fetching data: {err}")
-        finally:
-            response.close()
-        return data
+            raise
+        if self._payload is not None and (
+            response.status == 304 or hash(response.body) == self._body_hash
+        ):
+            self.cache_hits += 1
+            return self._payload
+        self.cache_misses += 1
+        try:
+            self._payload = json_loads(response.body)
+        except ValueError as err:
+            self.transport.metrics.operation("GET /get").record_failure(
+                "invalid_payload"
+            )
+            _LOGGER.error(f"Invalid data from boiler: {err}")
+            raise
+        self._body_hash = hash(response.body)
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        self._async_schedule_save()
+        return self._payload
 
-    async def async_set_target_temperature(self, temperature: float) -> None:
-        """Set target temperature."""
+    async def async_load_snapshot(self) -> bool:
+        """Start from the payload saved before the last restart.
+
+        Returns False when there is no snapshot, in which case the caller
+        has to wait for a live refresh.  The snapshot counts as stale until
+        the gateway answers, and expires like any other stale data.
+        """
+        if not (snapshot := await self._store.async_load()):
+            return False
+        self._payload = snapshot["payload"]
+        self.last_good_update = dt_util.parse_datetime(snapshot["updated"])
+        self.stale = True
+        self.energy.restore(snapshot.get("energy", {}))
+        if self.heat_curve is not None:
+            self.heat_curve.restore(snapshot.get("heat_curve", {}))
+        self.async_set_updated_data(self._payload)
+        return True
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the snapshot within ``STORAGE_SAVE_DELAY`` seconds.
+
+        ``Store.async_delay_save`` restarts its timer on every call, which
+        with frequent updates would put the save off indefinitely.
+        """
+        if self._payload is not None and not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data saved for the next start."""
+        self._save_pending = False
+        return {
+            "payload": self._payload,
+            "energy": self.energy.as_dict(),
+            "heat_curve": self.heat_curve.as_dict() if self.heat_curve else {},
+            "updated": self.last_good_update.isoformat()
+            if self.last_good_update
+            else dt_util.utcnow().isoformat(),
+        }
+
+    async def async_stream(self) -> None:
+        """Follow the gateway's event stream, polling while it is down.
+
+        Each event is a partial payload merged into the current data.  When
+        the gateway does not offer a stream the coordinator keeps polling.
+        """
+        backoff = STREAM_BACKOFF_MIN
+        while True:
+            try:
+                async for update in self.transport.async_events(STREAM_PATH):
+                    if not self.streaming:
+                        self._set_streaming(True)
+                        backoff = STREAM_BACKOFF_MIN
+                        # Resync so the deltas apply to a fresh snapshot.
+                        self._cold_due = 0.0
+                        await self.async_refresh()
+                    if self.data is None:
+                        # No payload to apply the delta to, fetch one instead.
+                        await self.async_request_refresh()
+                        continue
+                    self._mark_fresh()
+                    self.async_set_updated_data(merge_update(self.data, update))
+            except aiohttp.ClientResponseError as err:
+                if err.status in (404, 405, 501):
+                    _LOGGER.info("Gateway does not support streaming, polling")
+                    return
+                _LOGGER.debug("Event stream rejected: %s", err)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+                _LOGGER.debug("Event stream interrupted: %s", err)
+            if self.streaming:
+                self._set_streaming(False)
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, STREAM_BACKOFF_MAX)
+
+    def _set_streaming(self, streaming: bool) -> None:
+        """Switch between push updates and regular polling."""
+        self.streaming = streaming
+        if streaming:
+            _LOGGER.debug("Event stream connected")
+            self.update_interval = timedelta(seconds=STREAM_RESYNC_INTERVAL)
+        else:
+            _LOGGER.debug("Event stream lost, falling back to polling")
+            self.update_interval = self.poll_interval
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_post(
+        self, path: str, payload: dict[str, Any], what: str
+    ) -> None:
+        """Post a JSON payload, sharing an identical post in flight."""
+        body = json.dumps(payload, sort_keys=True)
         try:
-            await self.hass.async_add_executor_job(
-                self._set_target_temperature, temperature
+            await self._async_single_flight(
+                f"POST {path} {body}",
+                lambda: self.transport.async_request("POST", path, json=payload),
             )
-        except Exception as err:
-            raise UpdateFailed(f"Error setting target temperature: {err}") from err
+        except asyncio.TimeoutError:
+            _LOGGER.error("Request timed out")
+            raise
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Error setting {what}: {err}")
+            raise
 
-    async def async_set_heating(self, heating: bool) -> None:
-        """Set heating."""
+    async def _async_queue_write(self, payload: dict[str, Any]) -> None:
+        """Queue values for /set and wait until they have been sent.
+
+        Every write restarts the debounce timer, so a burst of changes (a
+        thermostat slider being dragged) ends up as a single request with
+        the latest value of each key, followed by one refresh.  A write of
+        values that are already pending just waits for them.
+        """
+        if self._unsub_write is not None and (
+            payload.items() <= self._pending_writes.items()
+        ):
+            self.writes_deduplicated += 1
+            duplicate: asyncio.Future[None] = self.hass.loop.create_future()
+            self._write_waiters.append(duplicate)
+            await duplicate
+            return
+        self._async_apply_optimistic(payload)
+        self._pending_writes.update(payload)
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._write_waiters.append(future)
+        if self._unsub_write is not None:
+            self._unsub_write()
+        self._unsub_write = async_call_later(
+            self.hass, WRITE_DEBOUNCE, self._async_flush_writes
+        )
+        await future
+
+    async def _async_flush_writes(self, _now: Any = None) -> None:
+        """Send the pending /set body and confirm it."""
+        self._unsub_write = None
+        payload, self._pending_writes = self._pending_writes, {}
+        waiters, self._write_waiters = self._write_waiters, []
+        if not payload:
+            return
+        self.writes_sent += 1
+        self.writes_coalesced += len(waiters) - 1
         try:
-            await self.hass.async_add_executor_job(self._set_heating, heating)
+            await self._async_post("/set", payload, ", ".join(payload))
         except Exception as err:
-            raise UpdateFailed(f"Error setting heating: {err}") from err
+            self._async_revert(payload)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(err)
+            return
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        await self._async_confirm(payload)
 
-    def _set_target_temperature(self, temperature: float) -> None:
-        """Set target temperature."""
+    @callback
+    def _async_apply_optimistic(self, payload: dict[str, Any]) -> None:
+        """Show commanded values before the boiler has confirmed them."""
+        if not self.optimistic or self.data is None:
+            return
+        for key in payload:
+            self._previous.setdefault(key, self.data.get(key))
+        self.async_set_updated_data(merge_update(self.data, payload))
+
+    @callback
+    def _async_revert(self, payload: dict[str, Any]) -> None:
+        """Restore the values an optimistic write replaced."""
+        if not self.optimistic or self.data is None:
+            return
+        previous = {key: self._previous.pop(key, None) for key in payload}
+        _LOGGER.warning("Write failed, reverting %s", ", ".join(payload))
+        self.async_set_updated_data(merge_update(self.data, previous))
+
+    async def _async_confirm(self, payload: dict[str, Any]) -> None:
+        """Check a successful write against the boiler."""
+        if not self.optimistic:
+            # The written keys may be cold, so fetch the whole payload.
+            self._cold_due = 0.0
+            await self.async_request_refresh()
+            return
+        self._unverified.update(payload)
+        await self._verifier.async_call()
+
+    async def _async_verify_writes(self) -> None:
+        """Read the written keys back and roll back values the boiler rejected.
+
+        The debouncer runs this ``VERIFY_DELAY`` seconds after the first of
+        a burst of writes.  Only the written keys are read, with
+        ``/get?fields=`` where the gateway supports it, and the read stands
+        in for the refresh that would otherwise follow the write.
+        """
+        expected, self._unverified = self._unverified, {}
+        for key in expected:
+            self._previous.pop(key, None)
         try:
-            response = requests.post(
-                f"http://{self.host}:{self.port}/set",
-                json={"target_temperature": temperature},
-                timeout=5,
+            read = None
+            if self.partial_fetch and self.data is not None:
+                read = await self._async_fetch_fields(tuple(expected))
+            if read is None:
+                data = await self._async_fetch_data()
+            else:
+                data = merge_update(self.data, read)
+        except Exception as err:
+            _LOGGER.debug("Verification read failed: %s", err)
+            await self.async_request_refresh()
+            return
+        for key, value in expected.items():
+            if not values_match(value, data.get(key)):
+                self.writes_rejected += 1
+                _LOGGER.warning(
+                    "Boiler did not accept %s=%s, it reports %s",
+                    key,
+                    value,
+                    data.get(key),
+                )
+        self.async_set_updated_data(data)
+
+    async def async_set_many(self, values: dict[str, Any]) -> dict[str, WriteResult]:
+        """Write any combination of writable keys, returning a result per key.
+
+        Keys are validated against ``WRITABLE_KEYS``; invalid ones are
+        reported and left out while the rest are still written.  All /set
+        keys share one request, so changing the mode and two setpoints
+        costs a single round-trip.
+        """
+        results: dict[str, WriteResult] = {}
+        writes: dict[str, Any] = {}
+        overrides: dict[str, Any] = {}
+        for key, value in values.items():
+            if (validator := WRITABLE_KEYS.get(key)) is None:
+                results[key] = WriteResult(False, "not writable")
+                continue
+            try:
+                value = validator(value)
+            except vol.Invalid as err:
+                results[key] = WriteResult(False, str(err))
+                continue
+            (overrides if key in OVERRIDE_KEYS else writes)[key] = value
+
+        requests: list[tuple[list[str], Any]] = [
+            ([key], self._async_override(key, value))
+            for key, value in overrides.items()
+        ]
+        if writes:
+            requests.append((list(writes), self._async_queue_write(writes)))
+        outcomes = await asyncio.gather(
+            *(request for _, request in requests), return_exceptions=True
+        )
+        for (keys, _), outcome in zip(requests, outcomes, strict=True):
+            result = (
+                WriteResult(False, str(outcome) or type(outcome).__name__)
+                if isinstance(outcome, Exception)
+                else WriteResult(True)
             )
-            response.raise_for_status()
-        except requests.Timeout:
-            _LOGGER.error("Request timed out")
-        except requests.RequestException as err:
-            _LOGGER.error(f"Error setting target temperature: {err}")
-        finally:
-            response.close()
+            results.update(dict.fromkeys(keys, result))
+        return results
 
-    def _set_heating(self, heating: bool) -> None:
-        """Set heating."""
+    async def _async_override(self, key: str, state: bool) -> None:
+        """Force a switch through /override."""
+        self._async_apply_optimistic({key: state})
         try:
-            response = requests.post(
-                f"http://{self.host}:{self.port}/set",
-                json={"mode": "heating" if heating else "off"},
-                timeout=5,
+            await self._async_post(
+                f"/override?force_heating={'1' if state else '0'}",
+                {key: state},
+                f"switch {key}",
             )
-            response.raise_for_status()
-        except requests.Timeout:
-            _LOGGER.error("Request timed out")
-        except requests.RequestException as err:
-            _LOGGER.error(f"Error setting heating: {err}")
-        finally:
-            response.close()
+        except Exception:
+            self._async_revert({key: state})
+            raise
+        await self._async_confirm({key: state})
 
-    async def async_set_switch(self, key: str, state: bool) -> None:
-        """Set switch state."""
+    async def _async_set(self, what: str, **values: Any) -> None:
+        """Write values, raising UpdateFailed if any of them failed."""
+        for result in (await self.async_set_many(values)).values():
+            if not result.success:
+                raise UpdateFailed(f"Error setting {what}: {result.error}")
+
+    async def async_set_target_temperature(self, temperature: float) -> None:
+        """Set target temperature.
+
+        While the heat curve is active this is the comfort temperature the
+        curve is built for, and the room setpoint follows from the curve.
+        """
+        if self.heat_curve is None:
+            await self._async_set("target temperature", target_temperature=temperature)
+            return
+        self.heat_curve.set_comfort(temperature)
+        self._async_schedule_save()
+        if (setpoint := self.heat_curve.propose(time.monotonic(), self.state)) is None:
+            return
         try:
-            await self.hass.async_add_executor_job(self._set_switch, key, state)
-        except Exception as err:
-            raise UpdateFailed(f"Error setting switch {key}: {err}") from err
+            await self._async_set("target temperature", target_temperature=setpoint)
+        except Exception:
+            self.heat_curve.cancel()
+            raise
+        self.heat_curve.commit(time.monotonic())
 
-    def _set_switch(self, key: str, state: bool) -> None:
+    async def async_set_heating(self, heating: bool) -> None:
+        """Set heating."""
+        await self._async_set("heating", mode="heating" if heating else "off")
+
+    async def async_set_switch(self, key: str, state: bool) -> None:
         """Set switch state."""
-        try:
-            response = requests.post(
-                f"http://{self.host}:{self.port}/override?force_heating={'1' if state else '0'}",
-                json={key: state},
-                timeout=5,
+        await self._async_set(f"switch {key}", **{key: state})
+
+    def collect_metrics(self) -> dict[str, Any]:
+        """Return runtime counters for the diagnostic sensors."""
+        requests = self.transport.metrics
+        poll = requests.operation("GET /get")
+        hot_poll = requests.operation("GET /get?fields")
+        return {
+            "poll_latency_p50": percentile(poll.recent, 0.5),
+            "poll_latency_p95": percentile(poll.recent, 0.95),
+            "hot_poll_latency_p95": percentile(hot_poll.recent, 0.95),
+            "poll_response_size": poll.last_size,
+            "poll_slot_wait_p95": percentile(requests.slot_wait, 0.95),
+            "request_retries": requests.retries,
+            "request_failures": requests.failures,
+            "circuit_state": self.transport.breaker.state,
+            "last_good_update": self.last_good_update,
+            "data_stale": self.stale,
+            **self.scheduler.stats,
+            # Entities notify in arbitrary order, so report the last
+            # complete refresh rather than the one in progress.
+            "suppressed_writes": self.last_suppressed_writes,
+            "writes_sent": self.writes_sent,
+            "writes_coalesced": self.writes_coalesced,
+            "writes_rejected": self.writes_rejected,
+            "cache_hits": self.cache_hits,
+            "hot_polls": self.hot_polls,
+            "cold_polls": self.cold_polls,
+            "requests_merged": self.requests_merged,
+            "writes_deduplicated": self.writes_deduplicated,
+            "heat_curve_writes": self.heat_curve.writes if self.heat_curve else None,
+            "heat_loss_fits": self.heat_loss.fits,
+            "energy_gaps": self.energy.gaps,
+            "counter_resets": sum(
+                counter.resets for counter in self.energy.counters.values()
+            ),
+            "cache_hit_ratio": round(
+                100 * self.cache_hits / (self.cache_hits + self.cache_misses), 1
             )
-            response.raise_for_status()
-        except requests.Timeout:
-            _LOGGER.error("Request timed out")
-        except requests.RequestException as err:
-            _LOGGER.error(f"Error setting switch {key}: {err}")
-        finally:
-            response.close()
+            if self.cache_hits + self.cache_misses
+            else None,
+            "poll_interval": self.update_interval.total_seconds()
+            if self.update_interval
+            else None,
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, send pending writes, close the pool, save state."""
+        if self._unsub_write is not None:
+            self._unsub_write()
+            await self._async_flush_writes()
+        self._verifier.async_shutdown()
+        await super().async_shutdown()
+        await self.transport.async_close()
+        if self._payload is not None:
+            # the energy totals must not go back after a reload
+            await self._store.async_save(self._snapshot())
+        if self.history is not None:
+            self.history.seal()
+            await self.hass.async_add_executor_job(self.history.write)
 
     def get_name(self) -> str:
         """Return the name of the boiler."""
-        return (
-            self.data["boiler"]["name"]
-            if "boiler" in self.data and "name" in self.data["boiler"]
-            else "Ebus Glow-worm Boiler"
-        )
+        return self.state.boiler.name or "Ebus Glow-worm Boiler"
 
     async def async_set_hw_target_temp(self, temperature: float) -> None:
         """Set hot water target temperature."""
-        try:
-            await self.hass.async_add_executor_job(
-                self._set_hw_target_temp, temperature
-            )
-        except Exception as err:
-            raise UpdateFailed(
-                f"Error setting hot water target temperature: {err}"
-            ) from err
-
-    def _set_hw_target_temp(self, temperature: float) -> None:
-        """Set hot water target temperature."""
-        try:
-            response = requests.post(
-                f"http://{self.host}:{self.port}/set",
-                json={"hw_target_temp": int(temperature)},
-                timeout=5,
-            )
-            response.raise_for_status()
-        except requests.Timeout:
-            _LOGGER.error("Request timed out")
-        except requests.RequestException as err:
-            _LOGGER.error(f"Error setting hot water target temperature: {err}")
-        finally:
-            response.close()
+        await self._async_set(
+            "hot water target temperature", hw_target_temp=temperature
+        )
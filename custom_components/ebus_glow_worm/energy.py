@@ -0,0 +1,177 @@
+"""Energy accounting from the power and usage readings of the boiler."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime
+from typing import Any
+
+from .const import BOILER_MAX_POWER, ENERGY_MAX_GAP
+from .state import EbusBoilerData
+
+# keys of the values published by EnergyAccountant
+BURNER_ENERGY = "burner_energy"
+BURNER_ENERGY_HOUR = "burner_energy_hour"
+BURNER_ENERGY_TODAY = "burner_energy_today"
+USAGE_COUNTERS = ("usage_heating", "usage_hot_water")
+
+# A counter dropping below this fraction of its last value was reset by the
+# boiler; smaller drops are read glitches and are ignored.
+RESET_RATIO = 0.5
+
+
+class EnergyBuckets:
+    """Energy per period for the most recent periods, in a ring buffer."""
+
+    __slots__ = ("_totals", "_period")
+
+    def __init__(self, size: int) -> None:
+        """Initialize."""
+        self._totals = array("d", bytes(8 * size))
+        self._period: int | None = None
+
+    def add(self, period: int, energy: float) -> None:
+        """Add energy to a period, clearing the periods skipped since."""
+        size = len(self._totals)
+        if self._period is None or period - self._period >= size:
+            self._totals = array("d", bytes(8 * size))
+        elif period > self._period:
+            for skipped in range(self._period + 1, period + 1):
+                self._totals[skipped % size] = 0.0
+        elif period < self._period:
+            # the clock went back, keep counting into the current period
+            period = self._period
+        self._period = period
+        self._totals[period % size] += energy
+
+    def current(self, period: int) -> float:
+        """Return the energy of a period, 0 once it has left the buffer."""
+        if self._period is None:
+            return 0.0
+        if not 0 <= self._period - period < len(self._totals):
+            return 0.0
+        return self._totals[period % len(self._totals)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the buffer to carry over a restart."""
+        return {"period": self._period, "totals": self._totals.tolist()}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue from a buffer saved by ``as_dict``."""
+        if len(data["totals"]) == len(self._totals):
+            self._period = data["period"]
+            self._totals = array("d", data["totals"])
+
+
+class UsageCounter:
+    """Monotonic total of a boiler counter that may reset or glitch."""
+
+    __slots__ = ("last", "offset", "resets")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.last: float | None = None
+        self.offset = 0.0
+        self.resets = 0
+
+    def add(self, value: float) -> None:
+        """Record a reading of the counter."""
+        if self.last is not None and value < self.last:
+            if value >= self.last * RESET_RATIO:
+                return
+            self.offset += self.last
+            self.resets += 1
+        self.last = value
+
+    @property
+    def total(self) -> float | None:
+        """Return the counter corrected for resets."""
+        return None if self.last is None else self.offset + self.last
+
+
+class EnergyAccountant:
+    """Integrate burner power and keep boiler counters monotonic.
+
+    ``power`` is the burner modulation in percent of ``BOILER_MAX_POWER``.
+    It is integrated with the trapezoidal rule over every poll, including
+    polls that returned an unchanged payload and so saw the same power.
+    Intervals between samples longer than ``ENERGY_MAX_GAP`` are skipped
+    rather than guessed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.burner_energy = 0.0
+        self.hourly = EnergyBuckets(48)
+        self.daily = EnergyBuckets(31)
+        self.counters = {key: UsageCounter() for key in USAGE_COUNTERS}
+        self.gaps = 0
+        # time and power of the latest sample
+        self._sample: tuple[float, float] | None = None
+        self.values: dict[str, float | None] = {}
+
+    def seen(self, now: datetime) -> None:
+        """Account for a poll that returned the same payload as before."""
+        if self._sample is not None:
+            self._integrate(now, self._sample[1])
+
+    def add(self, now: datetime, state: EbusBoilerData) -> None:
+        """Account for a new payload."""
+        for key, counter in self.counters.items():
+            if (value := getattr(state.stat, key)) is not None:
+                counter.add(value)
+        if state.power is not None:
+            if self._sample is not None:
+                self._integrate(now, state.power)
+            else:
+                self._sample = (now.timestamp(), state.power)
+        self._publish(now)
+
+    def _integrate(self, now: datetime, power: float) -> None:
+        """Add the energy since the previous sample."""
+        timestamp = now.timestamp()
+        start, previous = self._sample
+        self._sample = (timestamp, power)
+        if not 0 <= timestamp - start <= ENERGY_MAX_GAP:
+            self.gaps += 1
+            return
+        energy = (
+            (previous + power) / 2 * (timestamp - start) * BOILER_MAX_POWER / 360000
+        )
+        self.burner_energy += energy
+        self.hourly.add(int(timestamp // 3600), energy)
+        self.daily.add(now.toordinal(), energy)
+
+    def _publish(self, now: datetime) -> None:
+        """Refresh the published values."""
+        self.values = {
+            BURNER_ENERGY: round(self.burner_energy, 3),
+            BURNER_ENERGY_HOUR: round(
+                self.hourly.current(int(now.timestamp() // 3600)), 3
+            ),
+            BURNER_ENERGY_TODAY: round(self.daily.current(now.toordinal()), 3),
+            **{key: counter.total for key, counter in self.counters.items()},
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals to carry over a restart."""
+        return {
+            BURNER_ENERGY: self.burner_energy,
+            "hourly": self.hourly.as_dict(),
+            "daily": self.daily.as_dict(),
+            "counters": {
+                key: {"last": counter.last, "offset": counter.offset}
+                for key, counter in self.counters.items()
+            },
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue from totals saved by ``as_dict``."""
+        self.burner_energy = data.get(BURNER_ENERGY, 0.0)
+        if "hourly" in data:
+            self.hourly.restore(data["hourly"])
+            self.daily.restore(data["daily"])
+        for key, saved in data.get("counters", {}).items():
+            if (counter := self.counters.get(key)) is not None:
+                counter.last = saved["last"]
+                counter.offset = saved["offset"]
@@ -0,0 +1,45 @@
+"""Base entity for the eBus Glow Worm boiler integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import EbusGlowWormCoordinator
+
+_UNSET = object()
+
+
+class EbusGlowWormEntity(CoordinatorEntity[EbusGlowWormCoordinator]):
+    """Coordinator entity that only writes state when its data changed."""
+
+    # Payload keys the entity reads; None means the entity derives its value
+    # from the coordinator and writes whenever that value changed.
+    _data_keys: frozenset[str] | None = None
+    _last_available: bool | None = None
+    _last_value: Any = _UNSET
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write if the entity's data did not change.
+
+        A change of availability is always written, so entities go
+        unavailable when a failed refresh keeps the old data around.
+        Entities without payload keys compare their value instead, so a
+        refresh that changed nothing costs them no write either.
+        """
+        available = self.available
+        if self._data_keys is None:
+            value = getattr(self, "native_value", None)
+            unchanged = value == self._last_value
+        else:
+            value = _UNSET
+            unchanged = self._data_keys.isdisjoint(self.coordinator.changed_keys)
+        if unchanged and available == self._last_available:
+            self.coordinator.suppressed_writes += 1
+            return
+        self._last_available = available
+        self._last_value = value
+        super()._handle_coordinator_update()
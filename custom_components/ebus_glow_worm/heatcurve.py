@@ -0,0 +1,177 @@
+"""Weather compensation driven by a heat curve computed in the integration.
+
+The gateway only accepts a room setpoint; the boiler derives the flow
+temperature it aims for, reported as ``desired_flow_temp``, from that
+setpoint and the outside temperature.  ``HeatCurveController`` works out
+the flow temperature the house needs from its own heat curve and nudges
+the room setpoint until the boiler's desired flow matches it.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .const import (
+    CURVE_FLOW_GAIN,
+    CURVE_HYSTERESIS,
+    CURVE_MAX_FLOW,
+    CURVE_MAX_OFFSET,
+    CURVE_MIN_FLOW,
+    CURVE_ROOM_GAIN,
+    CURVE_SETTLE_TIME,
+)
+from .state import EbusBoilerData
+
+# keys of the values published by HeatCurveController
+HEAT_CURVE_FLOW = "heat_curve_flow"
+HEAT_CURVE_SETPOINT = "heat_curve_setpoint"
+
+# outside temperatures covered by the lookup table, in TABLE_STEP steps
+TABLE_MIN = -30.0
+TABLE_MAX = 30.0
+TABLE_STEP = 0.5
+
+# radiator exponent, the curve bends as output grows less than linearly
+EMITTER_EXPONENT = 1.3
+
+# range and step of the room setpoint accepted by the gateway
+SETPOINT_MIN = 10.0
+SETPOINT_MAX = 30.0
+SETPOINT_STEP = 0.5
+
+
+class HeatCurve:
+    """Flow temperature needed at each outside temperature.
+
+    ``flow = room + shift + slope * (room - outside) ** (1 / 1.3)``, limited
+    to the flow range of the boiler.  The curve is tabulated once per room
+    temperature, so a lookup is an index and a linear interpolation.
+    """
+
+    __slots__ = ("slope", "shift", "room", "_table")
+
+    def __init__(self, slope: float, shift: float, room: float) -> None:
+        """Initialize."""
+        self.slope = slope
+        self.shift = shift
+        self.room = room
+        self._table = self._tabulate()
+
+    def _tabulate(self) -> array:
+        """Return the flow temperature at every step of the table."""
+        size = round((TABLE_MAX - TABLE_MIN) / TABLE_STEP) + 1
+        table = array("d", bytes(8 * size))
+        for index in range(size):
+            outside = TABLE_MIN + index * TABLE_STEP
+            demand = max(self.room - outside, 0.0) ** (1 / EMITTER_EXPONENT)
+            flow = self.room + self.shift + self.slope * demand
+            table[index] = min(max(flow, CURVE_MIN_FLOW), CURVE_MAX_FLOW)
+        return table
+
+    def set_room(self, room: float) -> None:
+        """Move the curve to a new room temperature."""
+        if room != self.room:
+            self.room = room
+            self._table = self._tabulate()
+
+    def flow(self, outside: float) -> float:
+        """Return the flow temperature for an outside temperature."""
+        position = (min(max(outside, TABLE_MIN), TABLE_MAX) - TABLE_MIN) / TABLE_STEP
+        index = min(int(position), len(self._table) - 2)
+        low = self._table[index]
+        return low + (self._table[index + 1] - low) * (position - index)
+
+
+class HeatCurveController:
+    """Pick the room setpoint that makes the boiler follow the heat curve.
+
+    The wanted flow is the curve value plus ``CURVE_ROOM_GAIN`` kelvin per
+    kelvin the room is below the comfort temperature.  Every kelvin of room
+    setpoint is taken to move the boiler's desired flow by
+    ``CURVE_FLOW_GAIN`` kelvin.  A new setpoint is only proposed once it
+    leaves the ``CURVE_HYSTERESIS`` band around the current one and the
+    boiler has had ``CURVE_SETTLE_TIME`` seconds to react to the last write,
+    so a slowly changing outside temperature costs a handful of writes a
+    day.  The setpoint stays within ``CURVE_MAX_OFFSET`` of the comfort
+    temperature.  While a proposed setpoint is being written nothing new is
+    proposed: an optimistic write shows the new setpoint before the boiler
+    has moved its desired flow, which would otherwise look like a setpoint
+    that is still too low.
+    """
+
+    def __init__(self, slope: float, shift: float, comfort: float) -> None:
+        """Initialize."""
+        self.curve = HeatCurve(slope, shift, comfort)
+        self.values: dict[str, float | None] = {}
+        self.writes = 0
+        self._written_at: float | None = None
+        self._writing = False
+
+    @property
+    def comfort(self) -> float:
+        """Return the room temperature the curve is built for."""
+        return self.curve.room
+
+    def set_comfort(self, comfort: float) -> None:
+        """Change the room temperature and evaluate at the next update."""
+        self.curve.set_room(comfort)
+        self._written_at = None
+
+    def propose(self, now: float, state: EbusBoilerData) -> float | None:
+        """Return a room setpoint to write, or None to leave it as it is.
+
+        A returned setpoint is in flight until ``commit`` or ``cancel``.
+        """
+        if self._writing:
+            return None
+        outside = state.outside_temp
+        target = state.target_temperature
+        desired = state.desired_flow_temp
+        if outside is None or target is None or desired is None:
+            return None
+        wanted = self.curve.flow(outside)
+        if state.inside_temp is not None:
+            wanted += CURVE_ROOM_GAIN * (self.comfort - state.inside_temp)
+        wanted = min(max(wanted, CURVE_MIN_FLOW), CURVE_MAX_FLOW)
+        setpoint = target + (wanted - desired) / CURVE_FLOW_GAIN
+        setpoint = min(
+            max(setpoint, self.comfort - CURVE_MAX_OFFSET, SETPOINT_MIN),
+            self.comfort + CURVE_MAX_OFFSET,
+            SETPOINT_MAX,
+        )
+        rounded = round(setpoint / SETPOINT_STEP) * SETPOINT_STEP
+        self.values = {
+            HEAT_CURVE_FLOW: round(wanted, 1),
+            HEAT_CURVE_SETPOINT: rounded,
+        }
+        if state.mode != "heating" or abs(setpoint - target) <= CURVE_HYSTERESIS:
+            return None
+        if self._written_at is not None and now - self._written_at < CURVE_SETTLE_TIME:
+            return None
+        if rounded == target:
+            return None
+        self._writing = True
+        return rounded
+
+    def commit(self, now: float) -> None:
+        """Record that the proposed setpoint was written."""
+        self._writing = False
+        self._written_at = now
+        self.writes += 1
+
+    def cancel(self) -> None:
+        """Forget a proposed setpoint whose write failed.
+
+        The next update proposes again instead of waiting the settle time.
+        """
+        self._writing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the comfort temperature to carry over a restart."""
+        return {"comfort": self.comfort}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Continue from a state saved by ``as_dict``."""
+        if (comfort := data.get("comfort")) is not None:
+            self.curve.set_room(comfort)
@@ -0,0 +1,276 @@
+"""Heat-loss coefficient and thermal time constant fitted from the readings.
+
+The house is modelled as a single thermal mass ``C`` warmed by the
+radiators and losing heat to the outside::
+
+    C dTin/dt = K (Tw - Tin) - H (Tin - Tout) + G
+
+with ``Tw`` the mean water temperature, ``(flow + return) / 2``, ``K`` the
+radiator output per kelvin, ``H`` the heat-loss coefficient and ``G`` the
+free gains from people, appliances and sun.  Samples are averaged into
+``HEAT_LOSS_STEP`` bins and a least-squares fit of the change of ``Tin``
+between consecutive bins over the last ``HEAT_LOSS_WINDOW`` bins gives
+``K/C``, ``H/C`` and ``G/C``.  Over days the burner output equals the
+radiator output, which sets ``K`` and so the scale of ``C`` and ``H``.  The
+time constant ``C/H`` is how fast the house cools with the heating off.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+from .const import (
+    BOILER_MAX_POWER,
+    HEAT_LOSS_MIN_ROWS,
+    HEAT_LOSS_STEP,
+    HEAT_LOSS_WINDOW,
+)
+from .history import COLUMNS, iter_chunks
+from .state import EbusBoilerData
+
+try:
+    import numpy as np
+except ImportError:  # Home Assistant ships numpy, but keep working without
+    np = None
+
+# keys of the values published by HeatLossModel
+HEAT_LOSS_COEFFICIENT = "heat_loss_coefficient"
+THERMAL_TIME_CONSTANT = "thermal_time_constant"
+
+
+def _solve_numpy(
+    step: float, bins: array, inside: array, outside: array, water: array
+) -> tuple[float, float, float] | None:
+    """Fit the model with one vectorized least-squares solve."""
+    number = np.frombuffer(bins, dtype=np.int64)
+    pairs = np.flatnonzero(np.diff(number) == 1)
+    if len(pairs) < HEAT_LOSS_MIN_ROWS:
+        return None
+    following = pairs + 1
+    tin, tout, tw = (np.frombuffer(column) for column in (inside, outside, water))
+    room = (tin[pairs] + tin[following]) / 2
+    design = np.column_stack(
+        (
+            (tw[pairs] + tw[following]) / 2 - room,
+            (tout[pairs] + tout[following]) / 2 - room,
+            np.ones(len(pairs)),
+        )
+    )
+    change = (tin[following] - tin[pairs]) / step
+    coefficients, _, rank, _ = np.linalg.lstsq(design, change, rcond=None)
+    if rank < 3:
+        return None
+    return float(coefficients[0]), float(coefficients[1]), float(coefficients[2])
+
+
+def _solve_python(normal: list[list[float]]) -> tuple[float, float, float] | None:
+    """Solve the normal equations, an augmented 3x3 matrix, without numpy."""
+    normal = [list(row) for row in normal]
+    # Gaussian elimination with partial pivoting
+    for pivot in range(3):
+        best = max(range(pivot, 3), key=lambda row: abs(normal[row][pivot]))
+        if abs(normal[best][pivot]) < 1e-12:
+            return None
+        normal[pivot], normal[best] = normal[best], normal[pivot]
+        for row in range(pivot + 1, 3):
+            factor = normal[row][pivot] / normal[pivot][pivot]
+            for column in range(pivot, 4):
+                normal[row][column] -= factor * normal[pivot][column]
+    solution = [0.0, 0.0, 0.0]
+    for row in (2, 1, 0):
+        known = sum(normal[row][column] * solution[column] for column in range(3))
+        solution[row] = (normal[row][3] - known) / normal[row][row]
+    return solution[0], solution[1], solution[2]
+
+
+class HeatLossModel:
+    """Bin the readings and refit the house model as bins complete.
+
+    ``add`` only updates the sums of the open bin; the fit runs once per
+    completed bin, over at most ``HEAT_LOSS_WINDOW`` rows.  With numpy it is
+    a single least-squares solve over the window.  Without it the normal
+    equations are updated as rows enter and leave the window, and rebuilt
+    once per lap to shed rounding drift, so either way a fit stays in the
+    low milliseconds.  Bins with hot water demand are dropped, since the
+    burner then heats the cylinder rather than the house.
+    """
+
+    def __init__(
+        self, step: int = HEAT_LOSS_STEP, window: int = HEAT_LOSS_WINDOW
+    ) -> None:
+        """Initialize."""
+        self.step = step
+        self.window = window
+        # one row per completed bin: its number and the mean readings
+        self._bins = array("q")
+        self._inside = array("d")
+        self._outside = array("d")
+        self._water = array("d")
+        self._power = array("d")
+        self._bin: int | None = None
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        self._count = 0
+        self._hot_water = False
+        # normal equations of the fit, and the sums that scale it
+        self._normal = [[0.0] * 4 for _ in range(3)]
+        self._pairs = 0
+        self._total_power = 0.0
+        self._total_excess = 0.0
+        self._appended = 0
+        self.fits = 0
+        self.values: dict[str, float | None] = {}
+
+    def __len__(self) -> int:
+        """Return the number of completed bins in the window."""
+        return len(self._bins)
+
+    def add_state(self, timestamp: float, state: EbusBoilerData) -> None:
+        """Add the readings of a payload."""
+        self.add(
+            timestamp,
+            state.inside_temp,
+            state.outside_temp,
+            state.flow_temp,
+            state.return_temp,
+            state.power,
+            state.stat.hwc_demand == "yes",
+        )
+
+    def add(
+        self,
+        timestamp: float,
+        inside: float | None,
+        outside: float | None,
+        flow: float | None,
+        return_: float | None,
+        power: float | None,
+        hot_water: bool = False,
+    ) -> None:
+        """Add one sample; ``power`` is the burner modulation in percent."""
+        number = int(timestamp // self.step)
+        if number != self._bin:
+            if self._bin is not None and number < self._bin:
+                # the clock went back, keep filling the open bin
+                number = self._bin
+            else:
+                self._close()
+                self._bin = number
+        if hot_water:
+            self._hot_water = True
+        if None in (inside, outside, flow, return_, power):
+            return
+        sums = self._sums
+        sums[0] += inside
+        sums[1] += outside
+        sums[2] += (flow + return_) / 2
+        sums[3] += power * BOILER_MAX_POWER * 10
+        self._count += 1
+
+    def _close(self) -> None:
+        """Store the open bin as a row and refit."""
+        count = self._count
+        if self._bin is not None and count and not self._hot_water:
+            sums = self._sums
+            self._bins.append(self._bin)
+            self._inside.append(sums[0] / count)
+            self._outside.append(sums[1] / count)
+            self._water.append(sums[2] / count)
+            self._power.append(sums[3] / count)
+            self._account(len(self._bins) - 1, 1.0)
+            if (excess := len(self._bins) - self.window) > 0:
+                for index in range(excess):
+                    self._account(index, -1.0)
+                for column in self._columns:
+                    del column[:excess]
+            self._appended += 1
+            if self._appended % self.window == 0:
+                self._rebuild()
+            self._fit()
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        self._count = 0
+        self._hot_water = False
+
+    @property
+    def _columns(self) -> tuple[array, ...]:
+        """Return the row arrays."""
+        return self._bins, self._inside, self._outside, self._water, self._power
+
+    def _account(self, index: int, sign: float) -> None:
+        """Add or remove a row and the pair it starts or ends in the sums.
+
+        A new row closes a pair with the row before it; a row leaving the
+        window opens one with the row after it.
+        """
+        self._total_power += sign * self._power[index]
+        self._total_excess += sign * max(self._water[index] - self._inside[index], 0)
+        first = index - 1 if sign > 0 else index
+        if first < 0 or self._bins[first + 1] - self._bins[first] != 1:
+            return
+        inside, outside, water = self._inside, self._outside, self._water
+        room = (inside[first] + inside[first + 1]) / 2
+        x = (
+            (water[first] + water[first + 1]) / 2 - room,
+            (outside[first] + outside[first + 1]) / 2 - room,
+            1.0,
+        )
+        y = (inside[first + 1] - inside[first]) / self.step
+        for row in range(3):
+            for column in range(3):
+                self._normal[row][column] += sign * x[row] * x[column]
+            self._normal[row][3] += sign * x[row] * y
+        self._pairs += int(sign)
+
+    def _rebuild(self) -> None:
+        """Recompute the sums from the rows."""
+        self._normal = [[0.0] * 4 for _ in range(3)]
+        self._pairs = 0
+        self._total_power = self._total_excess = 0.0
+        for index in range(len(self._bins)):
+            self._account(index, 1.0)
+
+    def _fit(self) -> None:
+        """Refit the model over the rows in the window."""
+        if np is not None:
+            solution = _solve_numpy(
+                self.step, self._bins, self._inside, self._outside, self._water
+            )
+        elif self._pairs >= HEAT_LOSS_MIN_ROWS:
+            solution = _solve_python(self._normal)
+        else:
+            solution = None
+        if solution is None:
+            return
+        emitter_rate, loss_rate, _ = solution
+        if emitter_rate <= 0 or loss_rate <= 0 or self._total_excess <= 0:
+            return
+        # burner output over the window spread over the radiator excess
+        emitter = self._total_power / self._total_excess
+        mass = emitter / emitter_rate
+        self.fits += 1
+        self.values = {
+            HEAT_LOSS_COEFFICIENT: round(loss_rate * mass, 1),
+            THERMAL_TIME_CONSTANT: round(1 / loss_rate / 3600, 1),
+        }
+
+    def add_history(self, buffer: Any, since: float) -> None:
+        """Add the samples of a history file recorded after ``since``.
+
+        History files do not record hot water demand, so every bin counts.
+        """
+        names = ("inside_temp", "outside_temp", "flow_temp", "return_temp", "power")
+        columns = {column.name: column for column in COLUMNS}
+        for base, views in iter_chunks(buffer):
+            decoded: list[Iterable[float | None]] = [
+                [
+                    None if raw == columns[name].missing else raw / columns[name].scale
+                    for raw in views[name]
+                ]
+                for name in names
+            ]
+            for offset, *readings in zip(views["time"], *decoded, strict=True):
+                if (timestamp := base + offset) >= since:
+                    self.add(timestamp, *readings)
+            for view in views.values():
+                view.release()
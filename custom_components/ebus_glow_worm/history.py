@@ -0,0 +1,280 @@
+"""Columnar on-disk history of the boiler readings.
+
+A history file starts with a 16 byte header (``MAGIC``, format version,
+column count) followed by chunks.  Each chunk has a 16 byte header (``CHNK``,
+row count, start time as a float64 epoch) and then one little-endian typed
+array per column of ``COLUMNS``, each padded to 8 bytes.  A row takes 14
+bytes, so a year of 10 s samples is about 44 MB, and ``iter_chunks`` reads
+the columns of a memory-mapped file as zero-copy memoryviews (or pass them
+to ``numpy.frombuffer``).
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterator
+import logging
+import mmap
+from pathlib import Path
+import struct
+import sys
+import threading
+from typing import Any, NamedTuple
+
+from .const import HISTORY_CHUNK_ROWS, HISTORY_FILE_SIZE, HISTORY_MAX_SIZE
+from .state import EbusBoilerData
+
+_LOGGER = logging.getLogger("EbusGW_" + __name__)
+
+MAGIC = b"EBGWHIST"
+VERSION = 1
+FILE_HEADER = struct.Struct("<8sHH4x")
+CHUNK_HEADER = struct.Struct("<4sId")
+CHUNK_TAG = b"CHNK"
+SUFFIX = ".ebgw"
+
+# flag bits of the "flags" column
+FLAG_GAS_ACTIVE = 1
+FLAG_PUMP_ACTIVE = 2
+
+
+class Column(NamedTuple):
+    """One column of the fixed history schema."""
+
+    name: str
+    typecode: str
+    # stored value = reading * scale; ``missing`` marks an absent reading
+    scale: float
+    missing: int
+
+
+# "time" holds whole seconds since the chunk start.
+COLUMNS: tuple[Column, ...] = (
+    Column("time", "H", 1, 0),
+    Column("flow_temp", "h", 10, -32768),
+    Column("return_temp", "h", 10, -32768),
+    Column("inside_temp", "h", 10, -32768),
+    Column("outside_temp", "h", 10, -32768),
+    Column("current_heat_loss", "h", 1, -32768),
+    Column("power", "B", 1, 255),
+    Column("flags", "B", 1, 0),
+)
+_MAX_OFFSET = 65535
+
+
+def _padded(size: int) -> int:
+    """Round a byte count up to the column alignment."""
+    return -(-size // 8) * 8
+
+
+def _encode(column: Column, value: float | None) -> int:
+    """Return the stored form of a reading."""
+    if value is None:
+        return column.missing
+    if column.typecode == "h":
+        return max(-32767, min(round(value * column.scale), 32767))
+    return max(0, min(round(value * column.scale), 254))
+
+
+def _pack_columns(base: float, columns: list[Any]) -> bytes:
+    """Return a chunk holding equally long column arrays."""
+    rows = len(columns[0])
+    parts = [CHUNK_HEADER.pack(CHUNK_TAG, rows, base)]
+    for values in columns:
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        data = bytes(values)
+        parts.append(data + bytes(_padded(len(data)) - len(data)))
+    return b"".join(parts)
+
+
+def iter_chunks(buffer: Any) -> Iterator[tuple[float, dict[str, memoryview]]]:
+    """Yield the start time and column views of every chunk of a file.
+
+    The views share memory with ``buffer``, typically an ``mmap``, and use
+    the host byte order, which is little-endian on every supported system.
+    """
+    view = memoryview(buffer).cast("B")
+    magic, version, count = FILE_HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION or count != len(COLUMNS):
+        raise ValueError("Not a history file of a supported version")
+    offset = FILE_HEADER.size
+    while offset + CHUNK_HEADER.size <= len(view):
+        tag, rows, base = CHUNK_HEADER.unpack_from(view, offset)
+        if tag != CHUNK_TAG:
+            raise ValueError(f"Corrupt history chunk at byte {offset}")
+        offset += CHUNK_HEADER.size
+        columns: dict[str, memoryview] = {}
+        for column in COLUMNS:
+            size = rows * struct.calcsize(column.typecode)
+            if offset + size > len(view):
+                # truncated by a crash while writing, ignore the remainder
+                return
+            columns[column.name] = view[offset : offset + size].cast(column.typecode)
+            offset += _padded(size)
+        yield base, columns
+
+
+class HistoryWriter:
+    """Buffer samples into chunks and append them to rotating files.
+
+    ``append`` runs in the event loop and only touches memory; finished
+    chunks queue up until ``write`` stores them from an executor thread.
+    Files are rotated at ``file_size`` and the oldest are deleted once the
+    directory exceeds ``max_size``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        chunk_rows: int = HISTORY_CHUNK_ROWS,
+        file_size: int = HISTORY_FILE_SIZE,
+        max_size: int = HISTORY_MAX_SIZE,
+    ) -> None:
+        """Initialize."""
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.file_size = file_size
+        self.max_size = max_size
+        self._columns = [array(column.typecode) for column in COLUMNS]
+        self._base: int | None = None
+        self.ready: deque[tuple[float, bytes]] = deque()
+        self._lock = threading.Lock()
+        self._file: Path | None = None
+        self.rows_written = 0
+
+    def append(self, timestamp: float, state: EbusBoilerData) -> None:
+        """Buffer one sample."""
+        second = int(timestamp)
+        if self._base is not None and not 0 <= second - self._base <= _MAX_OFFSET:
+            self.seal()
+        if self._base is None:
+            self._base = second
+        flags = (FLAG_GAS_ACTIVE if state.gas_active else 0) | (
+            FLAG_PUMP_ACTIVE if state.pump_active else 0
+        )
+        readings = (
+            state.flow_temp,
+            state.return_temp,
+            state.inside_temp,
+            state.outside_temp,
+            state.stat.current_heat_loss,
+            state.power,
+        )
+        self._columns[0].append(second - self._base)
+        for column, buffer, value in zip(
+            COLUMNS[1:-1], self._columns[1:-1], readings, strict=True
+        ):
+            buffer.append(_encode(column, value))
+        self._columns[-1].append(flags)
+        if len(self._columns[0]) >= self.chunk_rows:
+            self.seal()
+
+    def seal(self) -> None:
+        """Queue the buffered rows as a chunk."""
+        if self._base is None or not self._columns[0]:
+            return
+        self.ready.append((self._base, _pack_columns(self._base, self._columns)))
+        self._columns = [array(column.typecode) for column in COLUMNS]
+        self._base = None
+
+    def write(self) -> None:
+        """Append the queued chunks to disk; run in an executor."""
+        with self._lock:
+            while self.ready:
+                base, chunk = self.ready.popleft()
+                self._write_chunk(base, chunk)
+            self._enforce_cap()
+
+    def _write_chunk(self, base: float, chunk: bytes) -> None:
+        """Append one chunk, rotating the file when it is full."""
+        if (
+            self._file is None
+            or not self._file.exists()
+            or self._file.stat().st_size + len(chunk) > self.file_size
+        ):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file = self.directory / f"{int(base):010d}{SUFFIX}"
+            self._file.write_bytes(FILE_HEADER.pack(MAGIC, VERSION, len(COLUMNS)))
+        with self._file.open("ab") as file:
+            file.write(chunk)
+        self.rows_written += CHUNK_HEADER.unpack_from(chunk)[1]
+
+    def _enforce_cap(self) -> None:
+        """Delete the oldest files while the history exceeds its size cap."""
+        files = self.files()
+        total = sum(path.stat().st_size for path in files)
+        for path in files[:-1]:
+            if total <= self.max_size:
+                break
+            total -= path.stat().st_size
+            _LOGGER.debug("Removing old history file %s", path.name)
+            path.unlink()
+
+    def files(self) -> list[Path]:
+        """Return the history files, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob(f"*{SUFFIX}"))
+
+    def mapped(self, since: float) -> Iterator[mmap.mmap]:
+        """Yield the files that may hold rows from ``since`` on, mapped.
+
+        Each file is unmapped once the caller moves on to the next one, so
+        the views read from it must be released by then; run in an executor.
+        """
+        files = self.files()
+        for path, following in zip(files, [*files[1:], None], strict=True):
+            if following is not None and int(following.stem) <= since:
+                continue
+            if path.stat().st_size <= FILE_HEADER.size:
+                continue
+            with path.open("rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                yield mapped
+
+    def export(self, start: float, end: float, target: Path) -> int:
+        """Copy the rows between two epoch times to a new history file.
+
+        Whole files starting after ``end`` are skipped without being read.
+        Returns the number of rows exported; run in an executor.
+        """
+        self.write()
+        rows = 0
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, target.open("wb") as out:
+            out.write(FILE_HEADER.pack(MAGIC, VERSION, len(COLUMNS)))
+            for path in self.files():
+                if int(path.stem) > end or path.stat().st_size <= FILE_HEADER.size:
+                    continue
+                with path.open("rb") as file, mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    rows += self._export_file(mapped, start, end, out)
+        return rows
+
+    @staticmethod
+    def _export_file(mapped: mmap.mmap, start: float, end: float, out: Any) -> int:
+        """Write the rows of one file that fall into the range."""
+        rows = 0
+        for base, columns in iter_chunks(mapped):
+            times = columns["time"]
+            first = bisect_left(times, start - base)
+            last = bisect_right(times, end - base)
+            if first < last:
+                count = last - first
+                out.write(CHUNK_HEADER.pack(CHUNK_TAG, count, base))
+                for column in COLUMNS:
+                    data = columns[column.name][first:last]
+                    out.write(data)
+                    out.write(bytes(_padded(data.nbytes) - data.nbytes))
+                    data.release()
+                rows += count
+            for view in columns.values():
+                view.release()
+        return rows
@@ -0,0 +1,136 @@
+"""Request timing and failure statistics for the gateway transport."""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections import deque
+from typing import Any
+
+import aiohttp
+
+from .resilience import CircuitOpenError
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last
+# bucket counts everything slower.
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+RECENT_SAMPLES = 200
+
+
+def classify_failure(err: BaseException) -> str:
+    """Return a short failure class for an exception raised by a request."""
+    if isinstance(err, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(err, aiohttp.ClientResponseError):
+        return f"http_{err.status // 100}xx"
+    if isinstance(err, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(err, aiohttp.ClientConnectionError):
+        return "connection"
+    if isinstance(err, ValueError):
+        return "invalid_payload"
+    return "other"
+
+
+def percentile(samples: deque[float], fraction: float) -> float | None:
+    """Return a percentile of the samples by nearest rank."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(round(fraction * len(ordered)) - 1, 0)]
+
+
+class OperationStats:
+    """Counters and latency distribution for one kind of request."""
+
+    __slots__ = (
+        "count",
+        "retries",
+        "bytes",
+        "last_size",
+        "failures",
+        "buckets",
+        "recent",
+    )
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.count = 0
+        self.retries = 0
+        self.bytes = 0
+        self.last_size: int | None = None
+        self.failures: dict[str, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def record(self, latency_ms: float, size: int) -> None:
+        """Record a completed request."""
+        self.count += 1
+        self.bytes += size
+        self.last_size = size
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.recent.append(latency_ms)
+
+    def record_failure(self, kind: str) -> None:
+        """Record a failed request."""
+        self.failures[kind] = self.failures.get(kind, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for the diagnostics download."""
+        return {
+            "count": self.count,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "last_size": self.last_size,
+            "failures": dict(self.failures),
+            "latency_ms": {
+                "p50": percentile(self.recent, 0.5),
+                "p95": percentile(self.recent, 0.95),
+                "histogram": {
+                    f"le_{bound}": count
+                    for bound, count in zip(
+                        (*LATENCY_BUCKETS_MS, "inf"), self.buckets, strict=True
+                    )
+                },
+            },
+        }
+
+
+class RequestMetrics:
+    """Per-operation request statistics of one gateway."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.operations: dict[str, OperationStats] = {}
+        # time polls spent queued for a scheduler slot, in milliseconds
+        self.slot_wait: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def operation(self, name: str) -> OperationStats:
+        """Return the statistics of an operation such as ``GET /get``."""
+        if (stats := self.operations.get(name)) is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    @property
+    def retries(self) -> int:
+        """Return the retries over all operations."""
+        return sum(stats.retries for stats in self.operations.values())
+
+    @property
+    def failures(self) -> int:
+        """Return the failures over all operations."""
+        return sum(
+            sum(stats.failures.values()) for stats in self.operations.values()
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every statistic for the diagnostics download."""
+        return {
+            "operations": {
+                name: stats.as_dict() for name, stats in self.operations.items()
+            },
+            "slot_wait_ms": {
+                "p50": percentile(self.slot_wait, 0.5),
+                "p95": percentile(self.slot_wait, 0.95),
+            },
+        }
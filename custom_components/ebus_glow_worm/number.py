@@ -7,9 +7,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 from .coordinator import EbusGlowWormCoordinator
+from .entity import EbusGlowWormEntity
 
 
 from homeassistant.components.number import (
@@ -42,24 +42,24 @@ async def async_setup_entry(
 ) -> None:
     """Set up number entities from config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[EbusBoilerGlowWormNumber] = []
-
-    for description in NUMBER_TYPES:
-        if description.key == "hw_target_temp":
-            entities.append(
-                EbusBoilerGlowWormNumber(
-                    coordinator=coordinator,
-                    config_entry=entry,
-                    description=description,
-                )
+    descriptions = {description.key: description for description in NUMBER_TYPES}
+
+    @callback
+    def async_add_numbers(keys: list[str]) -> None:
+        """Add number entities once the gateway reports their keys."""
+        async_add_entities(
+            EbusBoilerGlowWormNumber(
+                coordinator=coordinator,
+                config_entry=entry,
+                description=descriptions[key],
             )
+            for key in keys
+        )
 
-    async_add_entities(entities)
+    coordinator.schema.async_add_platform(descriptions, async_add_numbers)
 
 
-class EbusBoilerGlowWormNumber(
-    CoordinatorEntity[EbusGlowWormCoordinator], NumberEntity
-):
+class EbusBoilerGlowWormNumber(EbusGlowWormEntity, NumberEntity):
     """Number entity for eBus Boiler Glow-worm."""
 
     _attr_has_entity_name = True
@@ -73,6 +73,7 @@ class EbusBoilerGlowWormNumber(
         """Initialize the number entity."""
         super().__init__(coordinator)
         self.entity_description = description
+        self._data_keys = frozenset({description.key})
         self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
         self._attr_native_value = self._get_value_from_coordinator()
         self._attr_device_info = {
@@ -81,18 +82,15 @@ class EbusBoilerGlowWormNumber(
         }
 
     @callback
-    def _get_value_from_coordinator(self) -> int | None:
+    def _get_value_from_coordinator(self) -> float | None:
         """Get the current value from coordinator data."""
-        if "hw_target_temp" in self.coordinator.data:
-            return self.coordinator.data["hw_target_temp"]
-        return None
+        return self.coordinator.state.hw_target_temp
 
     @property
-    def native_value(self) -> int | None:
+    def native_value(self) -> float | None:
         """Return the current value."""
         return self._get_value_from_coordinator()
 
     async def async_set_native_value(self, value: int) -> None:
         """Set the value."""
         await self.coordinator.async_set_hw_target_temp(value)
-        await self.coordinator.async_request_refresh()
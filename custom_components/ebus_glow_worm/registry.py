@@ -0,0 +1,137 @@
+"""Payload keys discovered from the gateway and compiled accessors to them."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+from .state import EbusBoilerData, EbusBoilerDataBoiler, EbusBoilerDataStat
+
+# payload section each model lives under, "" being the top level
+_SECTIONS: tuple[tuple[str, type], ...] = (
+    ("", EbusBoilerData),
+    ("stat", EbusBoilerDataStat),
+    ("boiler", EbusBoilerDataBoiler),
+)
+
+# sections whose keys become entities, "" being the top level
+DISCOVERED_SECTIONS = ("", "stat")
+
+# keys of the model in the discovered sections
+MODEL_KEYS = frozenset(EbusBoilerData.FIELDS) | frozenset(EbusBoilerDataStat.FIELDS)
+
+# keys a platform exposes, whether it takes unknown keys, and its callback
+_Platform = tuple[frozenset[str], bool, Callable[[list[str]], None]]
+
+
+@dataclass(slots=True, frozen=True)
+class Accessor:
+    """Direct path from an entity key to its value.
+
+    Coercion, the ``-1`` sentinel and scale/offset are already applied by
+    the model's parser, so reading a value is a single attribute lookup.
+    """
+
+    key: str
+    path: tuple[str, ...]
+    get: Callable[[EbusBoilerData], Any]
+
+    @property
+    def section(self) -> str:
+        """Return the payload section holding the key."""
+        return self.path[0] if len(self.path) > 1 else ""
+
+
+def compile_accessor(key: str) -> Accessor:
+    """Resolve the payload section of a key and compile its getter.
+
+    Keys the model does not know are read from the raw extra values.
+    """
+    for section, model in _SECTIONS:
+        if key in model.FIELDS:
+            path = (section, key) if section else (key,)
+            return Accessor(key, path, attrgetter(".".join(path)))
+    return Accessor(key, ("extra", key), lambda state: state.extra.get(key))
+
+
+class AccessorRegistry:
+    """Accessors registered by the entities, evaluated once per update."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._accessors: dict[str, Accessor] = {}
+        self._state: EbusBoilerData | None = None
+        self.values: dict[str, Any] = {}
+
+    def register(self, key: str) -> Accessor:
+        """Return the accessor for a key, compiling it on first use."""
+        if (accessor := self._accessors.get(key)) is None:
+            accessor = self._accessors[key] = compile_accessor(key)
+            if self._state is not None:
+                self.values[key] = accessor.get(self._state)
+        return accessor
+
+    def evaluate(self, state: EbusBoilerData) -> None:
+        """Recompute every registered value from a freshly parsed payload."""
+        self._state = state
+        self.values = {
+            key: accessor.get(state) for key, accessor in self._accessors.items()
+        }
+
+
+class SchemaRegistry:
+    """Route the keys the gateway reports to the platforms exposing them.
+
+    Platforms register the model keys they expose; keys the model does not
+    know go to the platforms registered with ``discover``.  On each new
+    payload only the key sets of the sections are compared with the
+    previous payload, and a key is routed once, when it first appears, so
+    entities for fields added by newer firmware show up without a reload.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.keys: set[str] = set()
+        self._section_keys: dict[str, frozenset[str]] = {}
+        self._platforms: list[_Platform] = []
+
+    def async_add_platform(
+        self,
+        keys: Collection[str],
+        add_entities: Callable[[list[str]], None],
+        *,
+        discover: bool = False,
+    ) -> None:
+        """Register a platform and hand it the keys seen so far."""
+        platform = (frozenset(keys), discover, add_entities)
+        self._platforms.append(platform)
+        self._route(sorted(self.keys), [platform])
+
+    def observe(self, data: dict[str, Any]) -> None:
+        """Route the keys of a payload that were not seen before."""
+        new: list[str] = []
+        for section in DISCOVERED_SECTIONS:
+            values = data.get(section, {}) if section else data
+            if not isinstance(values, dict):
+                continue
+            if values.keys() == self._section_keys.get(section):
+                continue
+            self._section_keys[section] = frozenset(values)
+            for key, value in values.items():
+                if key not in self.keys and not isinstance(value, (dict, list)):
+                    self.keys.add(key)
+                    new.append(key)
+        if new:
+            self._route(new, self._platforms)
+
+    def _route(self, keys: list[str], platforms: list[_Platform]) -> None:
+        """Hand each platform the keys it exposes."""
+        for claimed, discover, add_entities in platforms:
+            if routed := [
+                key
+                for key in keys
+                if key in claimed or (discover and key not in MODEL_KEYS)
+            ]:
+                add_entities(routed)
@@ -0,0 +1,84 @@
+"""Retry and circuit breaker policy for requests to the gateway."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+import aiohttp
+
+from .const import (
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_THRESHOLD,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+def is_transient(err: BaseException) -> bool:
+    """Return True for failures worth retrying."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status >= 500
+    return isinstance(
+        err, (asyncio.TimeoutError, aiohttp.ClientConnectionError)
+    ) and not isinstance(err, CircuitOpenError)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return the full-jitter delay before retry number ``attempt``."""
+    return random.uniform(
+        0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2**attempt)
+    )
+
+
+class CircuitBreaker:
+    """Stop sending requests to a gateway that keeps failing.
+
+    After ``threshold`` consecutive failed requests the circuit opens and
+    requests fail immediately.  Once ``reset_timeout`` has passed the
+    circuit is half open: the caller probes the gateway, and a successful
+    probe closes the circuit while a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return the current state of the circuit."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                self.trips += 1
+            self.opened_at = time.monotonic()
@@ -0,0 +1,85 @@
+"""Domain-wide poll scheduler shared by every configured boiler."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import MAX_CONCURRENT_POLLS, POLL_SPACING
+from .transport import ConnectionPool
+
+if TYPE_CHECKING:
+    from .coordinator import EbusGlowWormCoordinator
+
+
+class EbusGlowWormScheduler:
+    """Spread the polls of all gateways over time.
+
+    Every poll takes a slot at least ``POLL_SPACING`` seconds after the
+    previous one, so coordinators set up at the same moment drift apart
+    instead of hitting their gateways on the same tick, and at most
+    ``MAX_CONCURRENT_POLLS`` polls run at once.  The gateways also share
+    one connection pool, which keeps a connector per gateway.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.pool = ConnectionPool()
+        self.coordinators: set[EbusGlowWormCoordinator] = set()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self._next_slot = 0.0
+        self.polls_waiting = 0
+        self.polls_running = 0
+        self.polls_delayed = 0
+
+    def add(self, coordinator: EbusGlowWormCoordinator) -> None:
+        """Start scheduling a coordinator."""
+        self.coordinators.add(coordinator)
+
+    async def async_remove(self, coordinator: EbusGlowWormCoordinator) -> bool:
+        """Stop scheduling a coordinator, returning True once none are left."""
+        self.coordinators.discard(coordinator)
+        if self.coordinators:
+            return False
+        await self.pool.async_close()
+        return True
+
+    @asynccontextmanager
+    async def async_poll_slot(self) -> AsyncIterator[None]:
+        """Wait for the next free poll slot and hold it during the poll."""
+        now = self.hass.loop.time()
+        delay = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + POLL_SPACING
+        self.polls_waiting += 1
+        try:
+            if delay > 0:
+                self.polls_delayed += 1
+                await asyncio.sleep(delay)
+            await self._semaphore.acquire()
+        finally:
+            self.polls_waiting -= 1
+        self.polls_running += 1
+        try:
+            yield
+        finally:
+            self.polls_running -= 1
+            self._semaphore.release()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return health counters aggregated over every gateway."""
+        return {
+            **self.pool.stats,
+            "gateways": len(self.coordinators),
+            "gateways_online": sum(
+                coordinator.last_update_success for coordinator in self.coordinators
+            ),
+            "polls_running": self.polls_running,
+            "polls_waiting": self.polls_waiting,
+            "polls_delayed": self.polls_delayed,
+        }
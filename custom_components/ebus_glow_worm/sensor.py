@@ -1,20 +1,30 @@
 """Sensor platform for eBus Glow-worm boiler integration."""
 
 from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     UnitOfTemperature,
     PERCENTAGE,
     UnitOfEnergy,
     UnitOfPower,
+    UnitOfInformation,
     UnitOfPressure,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.typing import StateType
 from .const import DOMAIN
 from .coordinator import EbusGlowWormCoordinator
+from .energy import BURNER_ENERGY, BURNER_ENERGY_HOUR, BURNER_ENERGY_TODAY
+from .entity import EbusGlowWormEntity
+from .heatcurve import HEAT_CURVE_FLOW, HEAT_CURVE_SETPOINT
+from .heatloss import HEAT_LOSS_COEFFICIENT, THERMAL_TIME_CONSTANT
+from .trends import FLOW_RETURN_DELTA
 
 
 from homeassistant.components.sensor import (
@@ -74,22 +84,6 @@ SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    SensorEntityDescription(
-        key="usage_heating",
-        name="Heating Usage",
-        translation_key="usage_heating",
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        state_class=SensorStateClass.TOTAL_INCREASING,
-    ),
-    SensorEntityDescription(
-        key="usage_hot_water",
-        name="Hot Water Usage",
-        translation_key="usage_hot_water",
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        state_class=SensorStateClass.TOTAL_INCREASING,
-    ),
     SensorEntityDescription(
         key="current_heat_loss",
         name="House Estimated Heat Loss",
@@ -124,14 +118,374 @@ SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
     ),
 )
 
-STAT_KEYS = [
-    "usage_heating",
-    "usage_hot_water",
-    "current_heat_loss",
-    "water_pressure",
-    "runtime",
-    "hwc_demand",
-]
+# Totals kept by EbusGlowWormCoordinator.energy; the boiler's own counters
+# are published corrected for resets and read glitches.
+ENERGY_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="usage_heating",
+        name="Heating Usage",
+        translation_key="usage_heating",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="usage_hot_water",
+        name="Hot Water Usage",
+        translation_key="usage_hot_water",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=BURNER_ENERGY,
+        name="Burner Energy",
+        translation_key=BURNER_ENERGY,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key=BURNER_ENERGY_HOUR,
+        name="Burner Energy This Hour",
+        translation_key=BURNER_ENERGY_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+    ),
+    SensorEntityDescription(
+        key=BURNER_ENERGY_TODAY,
+        name="Burner Energy Today",
+        translation_key=BURNER_ENERGY_TODAY,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+    ),
+)
+
+# Values of EbusGlowWormCoordinator.heat_curve, set up when the option is on.
+HEAT_CURVE_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=HEAT_CURVE_FLOW,
+        name="Heat Curve Flow Temperature",
+        translation_key=HEAT_CURVE_FLOW,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=HEAT_CURVE_SETPOINT,
+        name="Heat Curve Room Setpoint",
+        translation_key=HEAT_CURVE_SETPOINT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+# Parameters of the house fitted by EbusGlowWormCoordinator.heat_loss.
+HEAT_LOSS_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=HEAT_LOSS_COEFFICIENT,
+        name="Fitted Heat Loss Coefficient",
+        translation_key=HEAT_LOSS_COEFFICIENT,
+        native_unit_of_measurement="W/K",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key=THERMAL_TIME_CONSTANT,
+        name="Fitted Thermal Time Constant",
+        translation_key=THERMAL_TIME_CONSTANT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EbusGlowWormTrendSensorEntityDescription(SensorEntityDescription):
+    """Rolling statistic of one payload key."""
+
+    series: str
+    statistic: str
+    factor: float = 1.0
+
+
+TREND_DESCRIPTIONS: tuple[EbusGlowWormTrendSensorEntityDescription, ...] = (
+    EbusGlowWormTrendSensorEntityDescription(
+        key="flow_return_delta_mean",
+        name="Flow Return Delta",
+        translation_key="flow_return_delta_mean",
+        series=FLOW_RETURN_DELTA,
+        statistic="mean",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    EbusGlowWormTrendSensorEntityDescription(
+        key="burner_duty_cycle",
+        name="Burner Duty Cycle",
+        translation_key="burner_duty_cycle",
+        series="gas_active",
+        statistic="time_weighted_mean",
+        factor=100,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    EbusGlowWormTrendSensorEntityDescription(
+        key="inside_temp_trend",
+        name="Inside Temperature Trend",
+        translation_key="inside_temp_trend",
+        series="inside_temp",
+        statistic="slope",
+        factor=3600,
+        native_unit_of_measurement="°C/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+    ),
+    EbusGlowWormTrendSensorEntityDescription(
+        key="current_heat_loss_trend",
+        name="Heat Loss Trend",
+        translation_key="current_heat_loss_trend",
+        series="current_heat_loss",
+        statistic="slope",
+        factor=3600,
+        native_unit_of_measurement="W/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    EbusGlowWormTrendSensorEntityDescription(
+        key="flow_temp_min",
+        name="Flow Temperature Minimum",
+        translation_key="flow_temp_min",
+        series="flow_temp",
+        statistic="minimum",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    EbusGlowWormTrendSensorEntityDescription(
+        key="flow_temp_max",
+        name="Flow Temperature Maximum",
+        translation_key="flow_temp_max",
+        series="flow_temp",
+        statistic="maximum",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+# Runtime counters read from EbusGlowWormCoordinator.metrics, which is
+# recomputed once per update.
+DIAGNOSTIC_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="poll_latency_p50",
+        name="Poll Latency p50",
+        translation_key="poll_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="poll_latency_p95",
+        name="Poll Latency p95",
+        translation_key="poll_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="hot_poll_latency_p95",
+        name="Hot Poll Latency p95",
+        translation_key="hot_poll_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="poll_response_size",
+        name="Poll Response Size",
+        translation_key="poll_response_size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="poll_slot_wait_p95",
+        name="Poll Slot Wait p95",
+        translation_key="poll_slot_wait_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    SensorEntityDescription(
+        key="request_retries",
+        name="Request Retries",
+        translation_key="request_retries",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="request_failures",
+        name="Request Failures",
+        translation_key="request_failures",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="connections_opened",
+        name="Connections Opened",
+        translation_key="connections_opened",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="connections_reused",
+        name="Connections Reused",
+        translation_key="connections_reused",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="connections_evicted",
+        name="Connection Pool Evictions",
+        translation_key="connections_evicted",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="gateways_online",
+        name="Gateways Online",
+        translation_key="gateways_online",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="polls_delayed",
+        name="Polls Delayed By Scheduler",
+        translation_key="polls_delayed",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="suppressed_writes",
+        name="Suppressed State Writes",
+        translation_key="suppressed_writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="writes_sent",
+        name="Setpoint Writes Sent",
+        translation_key="writes_sent",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="writes_coalesced",
+        name="Setpoint Writes Coalesced",
+        translation_key="writes_coalesced",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="writes_rejected",
+        name="Setpoint Writes Rejected",
+        translation_key="writes_rejected",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="requests_merged",
+        name="Gateway Requests Merged",
+        translation_key="requests_merged",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="heat_curve_writes",
+        name="Heat Curve Setpoint Writes",
+        translation_key="heat_curve_writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="heat_loss_fits",
+        name="Heat Loss Fits",
+        translation_key="heat_loss_fits",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key="cache_hit_ratio",
+        name="Poll Cache Hit Ratio",
+        translation_key="cache_hit_ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key="last_good_update",
+        name="Last Good Update",
+        translation_key="last_good_update",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="circuit_state",
+        name="Circuit State",
+        translation_key="circuit_state",
+        device_class=SensorDeviceClass.ENUM,
+        options=["closed", "open", "half_open"],
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="poll_interval",
+        name="Poll Interval",
+        translation_key="poll_interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -141,30 +495,98 @@ async def async_setup_entry(
 ) -> None:
     """Set up eBus Glow-worm boiler sensors from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[EbusGlowWormSensor] = []
+    entities: list[SensorEntity] = []
+    descriptions = {
+        description.key: description for description in SENSOR_DESCRIPTIONS
+    }
 
-    for description in SENSOR_DESCRIPTIONS:
-        if description.key in STAT_KEYS:
-            entities.append(
-                EbusGlowWormStatSensor(
+    @callback
+    def async_add_sensors(keys: list[str]) -> None:
+        """Add sensors for keys the gateway reports for the first time."""
+        new_entities: list[EbusGlowWormSensor] = []
+        for key in keys:
+            accessor = coordinator.accessors.register(key)
+            description = descriptions.get(key) or discovered_description(
+                key, coordinator.accessors.values.get(key)
+            )
+            sensor_class = (
+                EbusGlowWormStatSensor
+                if accessor.section == "stat"
+                else EbusGlowWormSensor
+            )
+            new_entities.append(
+                sensor_class(
                     coordinator=coordinator,
                     config_entry=entry,
                     description=description,
                 )
             )
-        else:
+        async_add_entities(new_entities)
+
+    for description in ENERGY_DESCRIPTIONS:
+        entities.append(
+            EbusGlowWormEnergySensor(
+                coordinator=coordinator,
+                config_entry=entry,
+                description=description,
+            )
+        )
+
+    if coordinator.heat_curve is not None:
+        for description in HEAT_CURVE_DESCRIPTIONS:
             entities.append(
-                EbusGlowWormSensor(
+                EbusGlowWormHeatCurveSensor(
                     coordinator=coordinator,
                     config_entry=entry,
                     description=description,
                 )
             )
 
+    for description in HEAT_LOSS_DESCRIPTIONS:
+        entities.append(
+            EbusGlowWormHeatLossSensor(
+                coordinator=coordinator,
+                config_entry=entry,
+                description=description,
+            )
+        )
+
+    for description in TREND_DESCRIPTIONS:
+        entities.append(
+            EbusGlowWormTrendSensor(
+                coordinator=coordinator,
+                config_entry=entry,
+                description=description,
+            )
+        )
+
+    for description in DIAGNOSTIC_DESCRIPTIONS:
+        entities.append(
+            EbusGlowWormDiagnosticSensor(
+                coordinator=coordinator,
+                config_entry=entry,
+                description=description,
+            )
+        )
+
     async_add_entities(entities)
+    coordinator.schema.async_add_platform(
+        descriptions, async_add_sensors, discover=True
+    )
+
 
+def discovered_description(key: str, value: Any) -> SensorEntityDescription:
+    """Describe a sensor for a key the model does not know yet."""
+    numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+    return SensorEntityDescription(
+        key=key,
+        name=key.replace("_", " ").capitalize(),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT if numeric else None,
+    )
 
-class EbusGlowWormSensor(CoordinatorEntity[EbusGlowWormCoordinator], SensorEntity):
+
+class EbusGlowWormSensor(EbusGlowWormEntity, SensorEntity):
     """Sensor for eBus Glow-worm boiler."""
 
     entity_description: SensorEntityDescription
@@ -178,6 +600,7 @@ class EbusGlowWormSensor(CoordinatorEntity[EbusGlowWormCoordinator], SensorEntit
         """Initialize the sensor."""
         super().__init__(coordinator, config_entry)
         self.entity_description = description
+        self._data_keys = frozenset({description.key})
         self._attr_unique_id = f"{config_entry.entry_id}-{description.key}"
         self._attr_device_info = {
             "identifiers": {(DOMAIN, config_entry.entry_id)},
@@ -187,20 +610,33 @@ class EbusGlowWormSensor(CoordinatorEntity[EbusGlowWormCoordinator], SensorEntit
     @property
     def native_value(self) -> StateType:
         """Return the sensor value."""
-        if self.entity_description.key in self.coordinator.data:
-            return self.coordinator.data[self.entity_description.key]
-        return None
+        return self.coordinator.accessors.values.get(self.entity_description.key)
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        if self.entity_description.key in self.coordinator.data:
-            return self.coordinator.data[self.entity_description.key] != -1
-        return False
+        """Return if the gateway answered recently and reports a value."""
+        return super().available and self.native_value is not None
 
 
-class EbusGlowWormStatSensor(CoordinatorEntity[EbusGlowWormCoordinator], SensorEntity):
-    """Sensor for eBus Glow-worm boiler."""
+class EbusGlowWormStatSensor(EbusGlowWormSensor):
+    """Sensor for a value from the boiler's ``stat`` section."""
+
+    def __init__(
+        self,
+        coordinator: EbusGlowWormCoordinator,
+        config_entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, description)
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": description.name,
+        }
+
+
+class EbusGlowWormEnergySensor(EbusGlowWormEntity, SensorEntity):
+    """Energy total kept by the coordinator's accounting stage."""
 
     entity_description: SensorEntityDescription
 
@@ -221,14 +657,92 @@ class EbusGlowWormStatSensor(CoordinatorEntity[EbusGlowWormCoordinator], SensorE
 
     @property
     def native_value(self) -> StateType:
-        """Return the sensor value."""
-        if self.entity_description.key in self.coordinator.data["stat"]:
-            return self.coordinator.data["stat"][self.entity_description.key]
-        return None
+        """Return the total."""
+        return self.coordinator.energy.values.get(self.entity_description.key)
+
+    @property
+    def available(self) -> bool:
+        """Return if the gateway answered recently and reports a value."""
+        return super().available and self.native_value is not None
+
+
+class EbusGlowWormHeatCurveSensor(EbusGlowWormEnergySensor):
+    """Value worked out by the coordinator's heat curve."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value."""
+        return self.coordinator.heat_curve.values.get(self.entity_description.key)
+
+
+class EbusGlowWormHeatLossSensor(EbusGlowWormEnergySensor):
+    """Parameter of the house fitted from the readings."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value."""
+        return self.coordinator.heat_loss.values.get(self.entity_description.key)
+
+
+class EbusGlowWormTrendSensor(EbusGlowWormEntity, SensorEntity):
+    """Rolling statistic computed from recent refreshes."""
+
+    entity_description: EbusGlowWormTrendSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: EbusGlowWormCoordinator,
+        config_entry: ConfigEntry,
+        description: EbusGlowWormTrendSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self.entity_description = description
+        self._attr_unique_id = f"{config_entry.entry_id}-{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": description.name,
+        }
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the statistic over the current window."""
+        description = self.entity_description
+        value = self.coordinator.trends.get(description.series, description.statistic)
+        return None if value is None else value * description.factor
+
+    @property
+    def available(self) -> bool:
+        """Return if the gateway answered recently and reports a value."""
+        return super().available and self.native_value is not None
+
+
+class EbusGlowWormDiagnosticSensor(EbusGlowWormEntity, SensorEntity):
+    """Diagnostic sensor exposing a coordinator runtime counter."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: EbusGlowWormCoordinator,
+        config_entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry)
+        self.entity_description = description
+        self._attr_unique_id = f"{config_entry.entry_id}-{description.key}"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": description.name,
+        }
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the counter value."""
+        return self.coordinator.metrics.get(self.entity_description.key)
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        if self.entity_description.key in self.coordinator.data["stat"]:
-            return self.coordinator.data["stat"][self.entity_description.key] != -1
-        return False
+        """Diagnostics stay available while the gateway is unreachable."""
+        return True
@@ -0,0 +1,97 @@
+"""Services of the eBus Glow Worm boiler integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_START,
+    ATTR_VALUES,
+    DOMAIN,
+    SERVICE_EXPORT_HISTORY,
+    SERVICE_SET_VALUES,
+)
+from .coordinator import EbusGlowWormCoordinator
+
+SET_VALUES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_VALUES): vol.All(dict, vol.Length(min=1)),
+    }
+)
+
+EXPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Required(ATTR_END): cv.datetime,
+    }
+)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, call: ServiceCall
+) -> EbusGlowWormCoordinator:
+    """Return the coordinator of the config entry a service call targets."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is None:
+        raise ServiceValidationError(f"Boiler {entry_id} is not loaded")
+    return coordinator
+
+
+async def _async_set_values(call: ServiceCall) -> ServiceResponse:
+    """Write several keys in one request and return the result of each."""
+    coordinator = _get_coordinator(call.hass, call)
+    results = await coordinator.async_set_many(call.data[ATTR_VALUES])
+    response: dict[str, Any] = {
+        key: {"success": result.success, "error": result.error}
+        for key, result in results.items()
+    }
+    return {"results": response}
+
+
+async def _async_export_history(call: ServiceCall) -> ServiceResponse:
+    """Write the recorded history of a time range to a file."""
+    coordinator = _get_coordinator(call.hass, call)
+    start = dt_util.as_utc(call.data[ATTR_START])
+    end = dt_util.as_utc(call.data[ATTR_END])
+    if start >= end:
+        raise ServiceValidationError("The start must be before the end")
+    try:
+        path, rows = await coordinator.async_export_history(start, end)
+    except ValueError as err:
+        raise ServiceValidationError(str(err)) from err
+    return {"path": str(path), "rows": rows}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_VALUES,
+        _async_set_values,
+        schema=SET_VALUES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_HISTORY,
+        _async_export_history,
+        schema=EXPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -1,40 +1,159 @@
-import logging
+"""Typed model of the payload served by the gateway's /get endpoint."""
+
+from __future__ import annotations
 
-from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
-from homeassistant.const import UnitOfTemperature
+from collections.abc import Callable
 from dataclasses import dataclass
+import logging
+from typing import Any, Self
+
+from .const import PARAMETERS_MAP
+
+_LOGGER = logging.getLogger("EbusGW_" + __name__)
+
+# Value the gateway reports for a reading it does not have.
+SENTINEL = -1
+
+# scale and offset per key, applied once while parsing
+_CONVERSIONS: dict[str, tuple[float, float]] = {
+    param["param_id"]: (param.get("scale", 1), param.get("offset", 0))
+    for param in PARAMETERS_MAP.values()
+}
+
+
+def _parse_fields(
+    data: dict[str, Any], fields: dict[str, Callable[[Any], Any]]
+) -> dict[str, Any]:
+    """Coerce the known fields of a payload section.
+
+    Missing keys, the ``-1`` sentinel and values that fail coercion all
+    become None, which the entities report as unavailable.
+    """
+    parsed: dict[str, Any] = {}
+    for key, coerce in fields.items():
+        value = data.get(key)
+        if value is None or value == SENTINEL:
+            parsed[key] = None
+            continue
+        try:
+            value = coerce(value)
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring invalid value for %s: %r", key, value)
+            parsed[key] = None
+            continue
+        scale, offset = _CONVERSIONS.get(key, (1, 0))
+        if (scale, offset) != (1, 0):
+            value = value * scale + offset
+        parsed[key] = value
+    return parsed
+
+
+def _extra_fields(
+    data: dict[str, Any], fields: dict[str, Callable[[Any], Any]]
+) -> dict[str, Any]:
+    """Return the scalar values of keys the model does not know yet.
+
+    Newer gateway firmware may report more fields than the model lists;
+    they are kept raw so discovered entities can still read them.
+    """
+    return {
+        key: None if value == SENTINEL else value
+        for key, value in data.items()
+        if key not in fields and isinstance(value, (str, int, float, bool))
+    }
 
 
 # data strcuture recived from boiler with description and types for each field
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EbusBoilerDataBoiler:
-    name: str
+    name: str | None
     #    model: str
     #    firmware: str
-    connected: bool
-    error: str
+    connected: bool | None
+    error: str | None
+
+    FIELDS = {"name": str, "connected": bool, "error": str}
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Parse the ``boiler`` section."""
+        return cls(**_parse_fields(data, cls.FIELDS))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class EbusBoilerDataStat:
-    usage_heating: float
-    usage_hot_water: float
-
-
-@dataclass
-class EbusoilerData:
-    mode: str
-    target_temperature: float
-    hw_target_temp: float
-    outside_temp: float
-    inside_temp: float
-    heat_loss_balance: int
-    flow_temp: float
-    return_temp: float
-    desired_flow_temp: int
-    power: int
-    gas_active: bool
-    pump_active: bool
-    consumption_heating: int
+    usage_heating: float | None
+    usage_hot_water: float | None
+    current_heat_loss: float | None
+    water_pressure: float | None
+    runtime: int | None
+    hwc_demand: str | None
+
+    FIELDS = {
+        "usage_heating": float,
+        "usage_hot_water": float,
+        "current_heat_loss": float,
+        "water_pressure": float,
+        "runtime": int,
+        "hwc_demand": str,
+    }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Parse the ``stat`` section."""
+        return cls(**_parse_fields(data, cls.FIELDS))
+
+
+@dataclass(slots=True, frozen=True)
+class EbusBoilerData:
+    mode: str | None
+    target_temperature: float | None
+    hw_target_temp: float | None
+    outside_temp: float | None
+    inside_temp: float | None
+    heat_loss_balance: int | None
+    flow_temp: float | None
+    return_temp: float | None
+    desired_flow_temp: int | None
+    power: int | None
+    gas_active: bool | None
+    pump_active: bool | None
+    consumption_heating: int | None
     stat: EbusBoilerDataStat
     boiler: EbusBoilerDataBoiler
+    # top-level and ``stat`` keys unknown to the model, by key
+    extra: dict[str, Any]
+
+    FIELDS = {
+        "mode": str,
+        "target_temperature": float,
+        "hw_target_temp": float,
+        "outside_temp": float,
+        "inside_temp": float,
+        "heat_loss_balance": int,
+        "flow_temp": float,
+        "return_temp": float,
+        "desired_flow_temp": int,
+        "power": int,
+        "gas_active": bool,
+        "pump_active": bool,
+        "consumption_heating": int,
+    }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Parse a full ``/get`` payload."""
+        stat = data.get("stat")
+        stat = stat if isinstance(stat, dict) else {}
+        boiler = data.get("boiler")
+        return cls(
+            **_parse_fields(data, cls.FIELDS),
+            stat=EbusBoilerDataStat.from_dict(stat),
+            boiler=EbusBoilerDataBoiler.from_dict(
+                boiler if isinstance(boiler, dict) else {}
+            ),
+            extra={
+                **_extra_fields(stat, EbusBoilerDataStat.FIELDS),
+                **_extra_fields(data, cls.FIELDS),
+            },
+        )
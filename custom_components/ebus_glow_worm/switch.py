@@ -9,9 +9,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 from .coordinator import EbusGlowWormCoordinator
+from .entity import EbusGlowWormEntity
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -36,18 +36,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up eBus Glow-worm boiler switches from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[EbusBoilerSwitch] = []
+    descriptions = {
+        description["key"]: description for description in SWITCH_TYPES.values()
+    }
 
-    for description in SWITCH_TYPES.values():
-        if description["key"] in coordinator.data:
-            entities.append(EbusBoilerSwitch(coordinator, description, entry))
+    @callback
+    def async_add_switches(keys: list[str]) -> None:
+        """Add switches once the gateway reports their keys."""
+        entities: list[EbusBoilerSwitch] = []
+        for key in keys:
+            coordinator.accessors.register(key)
+            entities.append(EbusBoilerSwitch(coordinator, descriptions[key], entry))
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    coordinator.schema.async_add_platform(descriptions, async_add_switches)
 
 
-class EbusBoilerSwitch(
-    CoordinatorEntity[EbusGlowWormCoordinator], dict[str, Any], SwitchEntity
-):
+class EbusBoilerSwitch(EbusGlowWormEntity, dict[str, Any], SwitchEntity):
     """Representation of a eBus Glow-worm boiler switch."""
 
     _attr_has_entity_name = True
@@ -65,6 +70,7 @@ class EbusBoilerSwitch(
             "name": coordinator.get_name(),
         }
         self.description = description
+        self._data_keys = frozenset({description["key"]})
         self._attr_unique_id = f"{entry.entry_id}_switch_{description['key']}"
         self._attr_translation_key = description["translation_key"]
         self._attr_name = f"{coordinator.get_name()} {description['name']}"
@@ -72,7 +78,7 @@ class EbusBoilerSwitch(
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        return self.coordinator.data[self.description["key"]]
+        return self.coordinator.accessors.values.get(self.description["key"])
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
@@ -88,10 +94,8 @@ class EbusBoilerSwitch(
             await self.coordinator.async_set_switch(self.description["key"], state)
         except Exception as err:
             _LOGGER.error("Failed to set %s: %s", self.description["key"], err)
-            return
-        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.description["key"] in self.coordinator.data
+        """Return if the gateway answered recently and reports a state."""
+        return super().available and self.is_on is not None
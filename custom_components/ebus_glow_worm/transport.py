@@ -0,0 +1,285 @@
+"""Keep-alive HTTP transport for the eBus Glow Worm gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    REQUEST_TIMEOUT,
+    RETRY_ATTEMPTS,
+    STREAM_READ_TIMEOUT,
+)
+from .metrics import OperationStats, RequestMetrics, classify_failure
+from .resilience import CircuitBreaker, CircuitOpenError, backoff_delay, is_transient
+
+_LOGGER = logging.getLogger("EbusGW_" + __name__)
+
+
+class GatewayResponse(NamedTuple):
+    """Status, headers and body of a gateway response."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+class ConnectionPool:
+    """Keep-alive connection pools for every gateway of the domain.
+
+    Each gateway gets its own connector, sized and timed out for small
+    embedded HTTP servers, plus a separate single connection for its
+    long-lived event stream.  The counters are shared, but connections
+    never are, so dropping the sockets of one gateway leaves the requests
+    and streams of the others alone.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        """Initialize."""
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._retiring: set[asyncio.Task[None]] = set()
+        self.opened = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the connection counters.
+
+        ``connections_evicted`` counts evictions, each of which drops the
+        request connections of one gateway.
+        """
+        return {
+            "connections_opened": self.opened,
+            "connections_reused": self.reused,
+            "connections_evicted": self.evicted,
+        }
+
+    async def _on_connection_create(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        self.opened += 1
+
+    async def _on_connection_reuse(
+        self,
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        self.reused += 1
+
+    def _session(self, key: str, limit: int) -> aiohttp.ClientSession:
+        """Return a pooled session, creating it on first use."""
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            connector = aiohttp.TCPConnector(
+                limit=limit, keepalive_timeout=self.idle_timeout
+            )
+            session = self._sessions[key] = aiohttp.ClientSession(
+                connector=connector, trace_configs=[trace]
+            )
+        return session
+
+    def session(self, base_url: str) -> aiohttp.ClientSession:
+        """Return the session for requests to a gateway."""
+        return self._session(base_url, self.pool_size)
+
+    def stream_session(self, base_url: str) -> aiohttp.ClientSession:
+        """Return the session holding the event stream of a gateway."""
+        return self._session(f"{base_url} stream", 1)
+
+    async def async_evict(self, base_url: str) -> None:
+        """Drop the request connections to one gateway.
+
+        Later requests open fresh sockets on a new session.  The old one is
+        closed after ``REQUEST_TIMEOUT``, once requests still running on it
+        have finished or timed out.
+        """
+        if (session := self._sessions.pop(base_url, None)) is not None:
+            self.evicted += 1
+            task = asyncio.get_running_loop().create_task(self._async_retire(session))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _async_retire(session: aiohttp.ClientSession) -> None:
+        """Close an evicted session once its requests are over."""
+        try:
+            await asyncio.sleep(REQUEST_TIMEOUT)
+        finally:
+            # also when the pool closes first and cancels the wait
+            await session.close()
+
+    async def async_close_gateway(self, base_url: str) -> None:
+        """Close the connections to a gateway that is being removed."""
+        for key in (base_url, f"{base_url} stream"):
+            if (session := self._sessions.pop(key, None)) is not None:
+                await session.close()
+
+    async def async_close(self) -> None:
+        """Close the pool."""
+        for task in self._retiring:
+            task.cancel()
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+
+class GatewayTransport:
+    """HTTP requests to one gateway over a keep-alive pool.
+
+    Transient failures (timeouts, connection errors, 5xx) are retried with
+    jittered exponential backoff, on fresh sockets after a connection
+    error.  A circuit breaker stops requests to a gateway that keeps
+    failing and health-checks it on ``/check`` before resuming.  Without a
+    shared pool the transport owns a private one.
+    """
+
+    def __init__(self, base_url: str, pool: ConnectionPool | None = None) -> None:
+        """Initialize."""
+        self.base_url = base_url
+        self._owns_pool = pool is None
+        self.pool = pool or ConnectionPool()
+        self.metrics = RequestMetrics()
+        self.breaker = CircuitBreaker()
+        self.timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        self.stream_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=REQUEST_TIMEOUT, sock_read=STREAM_READ_TIMEOUT
+        )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the connection counters of the pool."""
+        return self.pool.stats
+
+    async def async_check(self) -> bool:
+        """Return True if the gateway answers on ``/check``."""
+        try:
+            async with self.pool.session(self.base_url).get(
+                f"{self.base_url}/check", timeout=self.timeout
+            ) as response:
+                await response.read()
+                return response.status < 500
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def async_request(self, method: str, path: str, **kwargs: Any) -> bytes:
+        """Send a request and return the response body."""
+        return (await self.async_fetch(method, path, **kwargs)).body
+
+    async def async_fetch(
+        self, method: str, path: str, **kwargs: Any
+    ) -> GatewayResponse:
+        """Send a request and return the whole response."""
+        operation = f"{method} {path.partition('?')[0]}"
+        if params := kwargs.get("params"):
+            # Filtered reads are much smaller than full ones, keep them apart.
+            operation += "?" + "&".join(sorted(params))
+        stats = self.metrics.operation(operation)
+        start = time.monotonic()
+        try:
+            response = await self._async_fetch_with_retries(
+                stats, method, path, **kwargs
+            )
+        except Exception as err:
+            stats.record_failure(classify_failure(err))
+            raise
+        stats.record((time.monotonic() - start) * 1000, len(response.body))
+        return response
+
+    async def _async_fetch_with_retries(
+        self, stats: OperationStats, method: str, path: str, **kwargs: Any
+    ) -> GatewayResponse:
+        """Apply the circuit breaker and retry policy to a request."""
+        state = self.breaker.state
+        if state == CircuitBreaker.OPEN:
+            raise CircuitOpenError(f"Circuit open for {self.base_url}")
+        if state == CircuitBreaker.HALF_OPEN and not await self.async_check():
+            self.breaker.record_failure()
+            raise CircuitOpenError(f"Health check failed for {self.base_url}")
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                response = await self._async_fetch(method, path, **kwargs)
+            except Exception as err:
+                if not is_transient(err):
+                    # The gateway answered, it just did not like the request.
+                    self.breaker.record_success()
+                    raise
+                if attempt == RETRY_ATTEMPTS - 1:
+                    self.breaker.record_failure()
+                    raise
+                if isinstance(err, aiohttp.ClientConnectionError):
+                    # Possibly a keep-alive socket the gateway already closed.
+                    await self.pool.async_evict(self.base_url)
+                _LOGGER.debug("Retrying %s %s: %s", method, path, err)
+                stats.retries += 1
+                await asyncio.sleep(backoff_delay(attempt))
+            else:
+                self.breaker.record_success()
+                return response
+        raise AssertionError("unreachable")
+
+    async def _async_fetch(
+        self, method: str, path: str, **kwargs: Any
+    ) -> GatewayResponse:
+        async with self.pool.session(self.base_url).request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+        ) as response:
+            response.raise_for_status()
+            return GatewayResponse(
+                response.status, dict(response.headers), await response.read()
+            )
+
+    async def async_events(self, path: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield the JSON documents of a server-sent events stream.
+
+        Raises ``aiohttp.ClientResponseError`` if the gateway refuses the
+        stream, e.g. with 404 on firmware without push support.
+        """
+        async with self.pool.stream_session(self.base_url).get(
+            f"{self.base_url}{path}",
+            timeout=self.stream_timeout,
+            headers={"Accept": "text/event-stream"},
+        ) as response:
+            response.raise_for_status()
+            data: list[str] = []
+            async for raw in response.content:
+                line = raw.decode().rstrip("\r\n")
+                if line.startswith("data:"):
+                    data.append(line[5:].lstrip())
+                elif not line and data:
+                    yield json_loads("\n".join(data))
+                    data = []
+                # Comments (heartbeats), event names and ids are ignored.
+
+    async def async_close(self) -> None:
+        """Close the connections to the gateway, and the pool if it owns it."""
+        if self._owns_pool:
+            await self.pool.async_close()
+        else:
+            await self.pool.async_close_gateway(self.base_url)
@@ -0,0 +1,206 @@
+"""Rolling statistics over recent samples of the boiler payload."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterator
+
+from .const import TREND_WINDOW
+from .state import EbusBoilerData, EbusBoilerDataStat
+
+# series computed from two payload keys rather than read directly
+FLOW_RETURN_DELTA = "flow_return_delta"
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of (time, value) samples.
+
+    Sums for the mean, the time-weighted mean and the least-squares slope
+    are updated as samples enter and leave the window, and monotonic
+    queues track min/max, so adding a sample is O(1) amortized.  The sums
+    are rebuilt from the buffer once per lap to shed rounding drift.
+    """
+
+    __slots__ = (
+        "size",
+        "_times",
+        "_values",
+        "_weights",
+        "_held",
+        "_count",
+        "_head",
+        "_seq",
+        "_origin",
+        "_last",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_tv",
+        "_sum_w",
+        "_sum_wv",
+        "_min",
+        "_max",
+    )
+
+    def __init__(self, size: int) -> None:
+        """Initialize."""
+        self.size = size
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        # time since the previous sample, and that time times the value
+        # held during it, for the time-weighted mean
+        self._weights = array("d", bytes(8 * size))
+        self._held = array("d", bytes(8 * size))
+        self._count = 0
+        self._head = 0
+        self._seq = 0
+        self._origin: float | None = None
+        self._last: tuple[float, float] | None = None
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._sum_w = self._sum_wv = 0.0
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._count
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Append a sample, evicting the oldest once the window is full."""
+        if self._origin is None:
+            self._origin = timestamp
+        t = timestamp - self._origin
+        weight = 0.0
+        held = 0.0
+        if self._last is not None:
+            weight = max(t - self._last[0], 0.0)
+            held = self._last[1]
+        slot = self._head
+        if self._count == self.size:
+            self._forget(slot)
+        else:
+            self._count += 1
+        self._times[slot] = t
+        self._values[slot] = value
+        self._weights[slot] = weight
+        self._held[slot] = weight * held
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+        self._sum_w += weight
+        self._sum_wv += weight * held
+        self._last = (t, value)
+
+        seq = self._seq
+        self._seq += 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        oldest = self._seq - self._count
+        while self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max[0][0] < oldest:
+            self._max.popleft()
+
+        self._head = (slot + 1) % self.size
+        if self._head == 0:
+            self._rebuild()
+
+    def _forget(self, slot: int) -> None:
+        """Remove the sample in a slot from the running sums."""
+        t = self._times[slot]
+        value = self._values[slot]
+        self._sum_t -= t
+        self._sum_v -= value
+        self._sum_tt -= t * t
+        self._sum_tv -= t * value
+        self._sum_w -= self._weights[slot]
+        self._sum_wv -= self._held[slot]
+
+    def _rebuild(self) -> None:
+        """Recompute the running sums from the full buffer.
+
+        Times are also shifted so the oldest sample sits at zero, which
+        keeps the slope sums small however long the window has run.
+        """
+        shift = self._times[self._head]
+        self._origin += shift
+        self._last = (self._last[0] - shift, self._last[1])
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for index in range(self._count):
+            t = self._times[index] = self._times[index] - shift
+            value = self._values[index]
+            self._sum_t += t
+            self._sum_v += value
+            self._sum_tt += t * t
+            self._sum_tv += t * value
+        self._sum_w = sum(self._weights)
+        self._sum_wv = sum(self._held)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the sample mean."""
+        return self._sum_v / self._count if self._count else None
+
+    @property
+    def time_weighted_mean(self) -> float | None:
+        """Return the mean weighted by how long each value was held."""
+        return self._sum_wv / self._sum_w if self._sum_w > 0 else None
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the smallest value in the window."""
+        return self._min[0][1] if self._count else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the largest value in the window."""
+        return self._max[0][1] if self._count else None
+
+    @property
+    def slope(self) -> float | None:
+        """Return the least-squares slope in value units per second."""
+        n = self._count
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if n < 2 or denominator <= 0:
+            return None
+        return (n * self._sum_tv - self._sum_t * self._sum_v) / denominator
+
+
+def numeric_values(state: EbusBoilerData) -> Iterator[tuple[str, float]]:
+    """Yield every numeric reading of a parsed payload, booleans as 0/1."""
+    for model, section in ((state, EbusBoilerData), (state.stat, EbusBoilerDataStat)):
+        for key, coerce in section.FIELDS.items():
+            if coerce in (int, float, bool):
+                value = getattr(model, key)
+                if value is not None:
+                    yield key, float(value)
+    if state.flow_temp is not None and state.return_temp is not None:
+        yield FLOW_RETURN_DELTA, state.flow_temp - state.return_temp
+
+
+class TrendTracker:
+    """Rolling windows for every numeric key of the payload."""
+
+    def __init__(self, size: int = TREND_WINDOW) -> None:
+        """Initialize."""
+        self.size = size
+        self.windows: dict[str, RollingWindow] = {}
+
+    def add(self, timestamp: float, state: EbusBoilerData) -> None:
+        """Record the numeric values of a freshly parsed payload."""
+        for key, value in numeric_values(state):
+            if (window := self.windows.get(key)) is None:
+                window = self.windows[key] = RollingWindow(self.size)
+            window.add(timestamp, value)
+
+    def get(self, key: str, statistic: str) -> float | None:
+        """Return one statistic of a key's window."""
+        if (window := self.windows.get(key)) is None:
+            return None
+        return getattr(window, statistic)
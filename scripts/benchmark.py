@@ -0,0 +1,328 @@
+"""Benchmark coordinator refreshes against an in-process stub gateway.
+
+Starts ``StubGateway`` on a free local port, sets up a real Home Assistant
+instance with the coordinator and the entities of all four platforms, and
+times ``coordinator.async_refresh()`` for a range of payload sizes and
+entity counts:
+
+    python scripts/benchmark.py --iterations 200 --output bench.json
+
+Each scenario times hot refreshes, which fetch ``HOT_FIELDS`` with
+``/get?fields=``, and then cold ones, which fetch the whole payload that
+grows with the extra keys.  Stages measured per refresh:
+
+* ``refresh``: the whole ``async_refresh``, from taking a poll slot through
+  the fetch to the last entity state write
+* ``json``: decoding the response bodies inside the refresh
+* ``parse``: building ``EbusBoilerData`` from the refreshed payload
+* ``fanout``: ``async_update_listeners``, which diffs the payload, updates
+  the schema, trends, energy, heat loss, history and heat curve and then
+  calls every entity, including its state write
+* ``loop_cpu``: the event loop CPU time of the refresh
+
+Jobs the integration hands to the executor are counted as
+``executor_jobs``.  Entity copies for the multipliers above 1 are added
+without a unique ID, so they do not clash in the entity registry.  Results
+are printed (and optionally written) as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import inspect
+import json
+import logging
+import math
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from custom_components.ebus_glow_worm import (  # noqa: E402
+    climate,
+    number,
+    scheduler as scheduler_module,
+    sensor,
+    switch,
+)
+from custom_components.ebus_glow_worm.const import (  # noqa: E402
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    DOMAIN,
+)
+from custom_components.ebus_glow_worm import (  # noqa: E402
+    coordinator as coordinator_module,
+)
+from custom_components.ebus_glow_worm.coordinator import (  # noqa: E402
+    EbusGlowWormCoordinator,
+)
+from custom_components.ebus_glow_worm.scheduler import (  # noqa: E402
+    EbusGlowWormScheduler,
+)
+from custom_components.ebus_glow_worm.state import EbusBoilerData  # noqa: E402
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.bootstrap import async_load_base_functionality  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import HomeAssistant, callback  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+from homeassistant.util.json import json_loads  # noqa: E402
+from stub_gateway import StubGateway  # noqa: E402
+
+PLATFORMS = {
+    "climate": climate,
+    "number": number,
+    "sensor": sensor,
+    "switch": switch,
+}
+
+# A single gateway is polled back to back, so the spacing between the polls
+# of different gateways would only add a sleep to every refresh.
+scheduler_module.POLL_SPACING = 0.0
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/max of a list of durations in milliseconds."""
+    ordered = sorted(samples)
+    # nearest rank, so a handful of samples still gives one of them
+    rank = max(math.ceil(0.95 * len(ordered)), 1)
+    return {
+        "p50": round(statistics.median(ordered), 4),
+        "p95": round(ordered[rank - 1], 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def config_entry(port: int) -> config_entries.ConfigEntry:
+    """Return a config entry for the stub gateway.
+
+    The constructor gained keyword arguments over Home Assistant releases,
+    so only the ones this release accepts are passed.
+    """
+    arguments = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": "benchmark",
+        "data": {CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_PASSWORD: ""},
+        "source": config_entries.SOURCE_USER,
+        # no timed refresh during the run, every refresh is the benchmark's
+        "options": {CONF_MIN_INTERVAL: 3600, CONF_MAX_INTERVAL: 3600},
+        "unique_id": None,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": None,
+    }
+    accepted = inspect.signature(config_entries.ConfigEntry).parameters
+    return config_entries.ConfigEntry(
+        **{key: value for key, value in arguments.items() if key in accepted}
+    )
+
+
+async def async_add_platforms(
+    hass: HomeAssistant,
+    entry: config_entries.ConfigEntry,
+    multiplier: int,
+) -> tuple[list[EntityPlatform], list[Entity]]:
+    """Set up every platform ``multiplier`` times and return the entities."""
+    logger = logging.getLogger(__name__)
+    platforms: list[EntityPlatform] = []
+    entities: list[Entity] = []
+    for domain, module in PLATFORMS.items():
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logger,
+            domain=domain,
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        platforms.append(platform)
+        for copy in range(multiplier):
+
+            @callback
+            def async_add_entities(
+                new_entities: Any,
+                update_before_add: bool = False,
+                platform: EntityPlatform = platform,
+                copy: int = copy,
+            ) -> None:
+                """Add entities as the platform discovers them."""
+                new_entities = list(new_entities)
+                if copy:
+                    for entity in new_entities:
+                        entity._attr_unique_id = None
+                entities.extend(new_entities)
+                hass.async_create_task(platform.async_add_entities(new_entities))
+
+            await module.async_setup_entry(hass, entry, async_add_entities)
+    return platforms, entities
+
+
+async def run_scenario(
+    extra_keys: int, multiplier: int, iterations: int
+) -> dict[str, Any]:
+    """Time hot and cold refreshes for one payload size and entity count."""
+    gateway = StubGateway(stream=False, tick=3600, extra_keys=extra_keys)
+    runner = web.AppRunner(gateway.app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+
+    config_dir = tempfile.TemporaryDirectory()
+    hass = HomeAssistant(config_dir.name)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    entry = config_entry(port)
+    # as during a real setup, so the coordinator picks up its entry
+    config_entries.current_entry.set(entry)
+    scheduler = EbusGlowWormScheduler(hass)
+    coordinator = EbusGlowWormCoordinator(hass, entry, scheduler)
+    scheduler.add(coordinator)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    platforms, entities = await async_add_platforms(hass, entry, multiplier)
+
+    # samples of the refreshes being timed, by stage
+    timings: dict[str, list[float]] = {}
+    counters = {"executor_jobs": 0, "state_changes": 0}
+
+    def timed_json_loads(body: Any) -> Any:
+        """Time decoding a response body."""
+        start = time.perf_counter()
+        data = json_loads(body)
+        timings["json"].append((time.perf_counter() - start) * 1000)
+        return data
+
+    update_listeners = coordinator.async_update_listeners
+
+    @callback
+    def async_timed_update_listeners() -> None:
+        """Time the listener fan-out of a refresh."""
+        start = time.perf_counter()
+        update_listeners()
+        timings["fanout"].append((time.perf_counter() - start) * 1000)
+
+    add_executor_job = hass.async_add_executor_job
+
+    @callback
+    def async_counted_executor_job(target: Any, *args: Any) -> Any:
+        """Count the jobs the integration hands to the executor."""
+        counters["executor_jobs"] += 1
+        return add_executor_job(target, *args)
+
+    @callback
+    def async_count_state_change(_event: Any) -> None:
+        """Count the state writes that changed a state."""
+        counters["state_changes"] += 1
+
+    results: dict[str, Any] = {}
+    try:
+        # The first refresh discovers the keys and adds the entities.
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        coordinator_module.json_loads = timed_json_loads
+        coordinator.async_update_listeners = async_timed_update_listeners
+        hass.async_add_executor_job = async_counted_executor_job
+        hass.bus.async_listen(EVENT_STATE_CHANGED, async_count_state_change)
+        # Hot refreshes fetch HOT_FIELDS with ?fields=, cold ones the whole
+        # payload, which is what grows with the extra keys.
+        for kind in ("hot", "cold"):
+            coordinator.partial_fetch = kind == "hot"
+            timings.clear()
+            timings.update(
+                {stage: [] for stage in ("refresh", "json", "parse", "fanout")}
+            )
+            timings["loop_cpu"] = []
+            counters.update(executor_jobs=0, state_changes=0)
+            writes = suppressed = 0
+            for iteration in range(iterations):
+                # Change one value per refresh, as a modulating boiler would.
+                gateway.state["flow_temp"] = 40 + iteration % 10
+                cpu = time.thread_time()
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                timings["refresh"].append((time.perf_counter() - start) * 1000)
+                timings["loop_cpu"].append((time.thread_time() - cpu) * 1000)
+                # the entities counted their skipped writes during this fan-out
+                skipped = coordinator.suppressed_writes
+                suppressed += skipped
+                writes += len(entities) - skipped
+                start = time.perf_counter()
+                EbusBoilerData.from_dict(coordinator.data)
+                timings["parse"].append((time.perf_counter() - start) * 1000)
+            await hass.async_block_till_done()
+            operation = "GET /get?fields" if kind == "hot" else "GET /get"
+            results[kind] = {
+                "payload_bytes": coordinator.transport.metrics.operation(
+                    operation
+                ).last_size,
+                "state_writes": writes,
+                "suppressed_writes": suppressed,
+                **counters,
+                "ms": {
+                    stage: summarize(values)
+                    for stage, values in timings.items()
+                    if values
+                },
+            }
+    finally:
+        coordinator_module.json_loads = json_loads
+        for platform in platforms:
+            await platform.async_reset()
+        await coordinator.async_shutdown()
+        transport_stats = coordinator.transport.stats
+        await scheduler.async_remove(coordinator)
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+        config_dir.cleanup()
+
+    return {
+        "extra_keys": extra_keys,
+        "entities": len(entities),
+        "iterations": iterations,
+        "hot_polls": coordinator.hot_polls,
+        "cold_polls": coordinator.cold_polls,
+        "cache_hits": coordinator.cache_hits,
+        "connections": transport_stats,
+        **results,
+    }
+
+
+async def main() -> None:
+    """Run every scenario and report the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--payload-keys", type=int, nargs="+", default=[0, 100, 1000])
+    parser.add_argument("--entity-multipliers", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = [
+        await run_scenario(extra_keys, multiplier, args.iterations)
+        for extra_keys in args.payload_keys
+        for multiplier in args.entity_multipliers
+    ]
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        args.output.write_text(report + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
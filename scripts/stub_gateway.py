@@ -0,0 +1,376 @@
+"""Local stand-in for the eBus Glow Worm gateway.
+
+Serves ``/get``, ``/set``, ``/override``, ``/check`` and the ``/events``
+server-sent events stream so the integration can be exercised offline:
+
+    python scripts/stub_gateway.py --port 8080
+
+Point the integration at the host and port printed on startup.  Run with
+``--no-stream`` to emulate firmware without push support, and with
+``--etag`` to answer conditional GETs with 304 Not Modified.  ``/get``
+honours ``?fields=flow_temp,stat.hwc_demand`` unless run with
+``--no-fields``, which emulates firmware that ignores the filter.  With
+``--failure-rate 0.3`` about a third of the requests fail with 503 or a
+dropped connection, to exercise the retry and circuit breaker logic; set
+``down`` on the instance to fail every request.
+
+A simple thermal model drives the readings: the burner follows the mode,
+the target temperature and ``force_heating``, the radiators warm the room
+and the house loses heat to a daily outside temperature cycle.  ``--speed
+60`` runs the model a minute per second, ``--latency``/``--jitter`` delay
+every response and ``--seed`` makes jitter and failures repeatable:
+
+    python scripts/stub_gateway.py --speed 60 --latency 80 --jitter 40 --seed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+from typing import Any
+
+from aiohttp import web
+
+
+def initial_state() -> dict[str, Any]:
+    """Return a payload shaped like the real gateway's ``/get`` response."""
+    return {
+        "mode": "heating",
+        "target_temperature": 20.5,
+        "hw_target_temp": 45,
+        "outside_temp": 6.5,
+        "inside_temp": 19.8,
+        "heat_loss_balance": 0,
+        "flow_temp": 48.0,
+        "return_temp": 41.0,
+        "desired_flow_temp": 50,
+        "power": 35,
+        "gas_active": True,
+        "pump_active": True,
+        "consumption_heating": 0,
+        "stat": {
+            "usage_heating": 1520.4,
+            "usage_hot_water": 310.2,
+            "current_heat_loss": 4200,
+            "water_pressure": 1.4,
+            "runtime": 3120,
+            "hwc_demand": "no",
+        },
+        "boiler": {"name": "Stub Glow-worm", "connected": True, "error": ""},
+    }
+
+
+def apply_update(state: dict[str, Any], update: dict[str, Any]) -> None:
+    """Merge a partial update into the state in place."""
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(state.get(key), dict):
+            apply_update(state[key], value)
+        else:
+            state[key] = value
+
+
+def select_fields(state: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    """Return the fields of the state named like ``stat.hwc_demand``."""
+    selected: dict[str, Any] = {}
+    for field in fields:
+        section, _, key = field.rpartition(".")
+        source = state.get(section) if section else state
+        if isinstance(source, dict) and key in source:
+            target = selected.setdefault(section, {}) if section else selected
+            target[key] = source[key]
+    return selected
+
+
+class ThermalModel:
+    """Lumped model of a house heated by a modulating boiler.
+
+    The room is a single thermal mass losing heat through ``loss`` W/K to
+    the outside.  Radiators deliver heat in proportion to the difference
+    between the mean water and room temperatures, and the flow temperature
+    chases a weather-compensated setpoint while the burner is on.
+    """
+
+    mass = 2.0e7  # J/K, room air, furniture and walls
+    loss = 250.0  # W/K, fabric and ventilation losses
+    emitter = 600.0  # W/K, radiator output per kelvin above the room
+    water = 900.0  # W/K, heat carried by the pump flow
+    max_power = 24000.0  # W, full burner output
+    flow_response = 120.0  # s, time constant of the flow temperature
+    hysteresis = 0.2  # K around the target temperature
+
+    def __init__(self, state: dict[str, Any]) -> None:
+        """Initialize."""
+        self.state = state
+        self.elapsed = 0.0
+        self.burner = bool(state["gas_active"])
+        # set through /override; a control, not a reading the gateway reports
+        self.force_heating = False
+        # unrounded values, the payload only carries what the gateway shows
+        self.inside = float(state["inside_temp"])
+        self.flow = float(state["flow_temp"])
+        self.usage = float(state["stat"]["usage_heating"])
+        self.runtime = float(state["stat"]["runtime"])
+
+    def desired_flow(self) -> float:
+        """Return the weather-compensated flow temperature setpoint."""
+        state = self.state
+        curve = 20 + 1.5 * (state["target_temperature"] - state["outside_temp"])
+        return min(max(curve + (state["target_temperature"] - 20) * 2, 30.0), 75.0)
+
+    def step(self, seconds: float) -> dict[str, Any]:
+        """Advance the model and return the readings that changed."""
+        state = self.state
+        old = {key: state[key] for key in _MODEL_KEYS}
+        old_stat = {key: state["stat"][key] for key in _MODEL_STAT_KEYS}
+        self.elapsed += seconds
+        # 24 h outside cycle between 2 and 10 degrees, coldest at dawn
+        outside = 6 - 4 * math.cos(2 * math.pi * (self.elapsed / 86400 - 0.25))
+        inside = self.inside
+        target = state["target_temperature"]
+        if self.force_heating:
+            self.burner = True
+        elif state["mode"] != "heating":
+            self.burner = False
+        elif inside < target - self.hysteresis:
+            self.burner = True
+        elif inside > target + self.hysteresis:
+            self.burner = False
+
+        flow = self.flow
+        desired = self.desired_flow()
+        approach = 1 - math.exp(-seconds / self.flow_response)
+        if self.burner:
+            flow += (desired - flow) * approach
+        else:
+            flow += (inside - flow) * approach / 5
+        # mean water temperature is half the flow/return drop below the flow
+        output = max(
+            self.emitter * (flow - inside) / (1 + self.emitter / (2 * self.water)),
+            0.0,
+        )
+        heat_loss = self.loss * (inside - outside)
+        power = min(output, self.max_power) if self.burner else 0.0
+        inside += (output - heat_loss) * seconds / self.mass
+        self.inside = inside
+        self.flow = flow
+        self.usage += power * seconds / 3.6e6
+        if self.burner:
+            self.runtime += seconds / 60
+
+        state.update(
+            outside_temp=round(outside, 1),
+            inside_temp=round(inside, 1),
+            flow_temp=round(flow, 1),
+            return_temp=round(flow - output / self.water, 1),
+            desired_flow_temp=round(desired),
+            power=round(100 * power / self.max_power),
+            gas_active=self.burner,
+            pump_active=self.burner or flow - inside > 5,
+        )
+        stat = state["stat"]
+        stat["current_heat_loss"] = round(heat_loss)
+        stat["usage_heating"] = round(self.usage, 1)
+        stat["runtime"] = int(self.runtime)
+        update: dict[str, Any] = {
+            key: state[key] for key in _MODEL_KEYS if state[key] != old[key]
+        }
+        if changed := {
+            key: stat[key] for key in _MODEL_STAT_KEYS if stat[key] != old_stat[key]
+        }:
+            update["stat"] = changed
+        return update
+
+
+# readings written by ThermalModel.step
+_MODEL_KEYS = (
+    "outside_temp",
+    "inside_temp",
+    "flow_temp",
+    "return_temp",
+    "desired_flow_temp",
+    "power",
+    "gas_active",
+    "pump_active",
+)
+_MODEL_STAT_KEYS = ("current_heat_loss", "usage_heating", "runtime")
+
+
+class StubGateway:
+    """In-process fake gateway."""
+
+    def __init__(
+        self,
+        *,
+        stream: bool = True,
+        tick: float = 5.0,
+        extra_keys: int = 0,
+        etag: bool = False,
+        failure_rate: float = 0.0,
+        speed: float = 1.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int | None = None,
+        fields: bool = True,
+    ) -> None:
+        """Initialize.
+
+        ``tick`` is the wall-clock time between model steps in seconds and
+        ``speed`` how many simulated seconds pass per wall-clock second.
+        ``latency`` and ``jitter`` are the mean and standard deviation of
+        the response delay in milliseconds.
+        """
+        self.state = initial_state()
+        self.fields = fields
+        self.model = ThermalModel(self.state)
+        self.speed = speed
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.etag = etag
+        # Pad the payload to emulate firmware that reports more fields.
+        for index in range(extra_keys):
+            self.state[f"extra_{index}"] = float(index)
+        self.stream = stream
+        self.tick = tick
+        self.failure_rate = failure_rate
+        self.down = False
+        self.failures = 0
+        self._subscribers: set[asyncio.Queue[dict[str, Any]]] = set()
+        self.requests: dict[str, int] = {}
+
+    def publish(self, update: dict[str, Any]) -> None:
+        """Apply an update and push it to every stream subscriber."""
+        apply_update(self.state, update)
+        for queue in self._subscribers:
+            queue.put_nowait(update)
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application(middlewares=[self._count, self._delay, self._flaky])
+        app.router.add_get("/get", self.handle_get)
+        app.router.add_post("/set", self.handle_set)
+        app.router.add_post("/override", self.handle_override)
+        app.router.add_get("/check", self.handle_check)
+        if self.stream:
+            app.router.add_get("/events", self.handle_events)
+        app.on_startup.append(self._start_model)
+        app.on_cleanup.append(self._stop_model)
+        return app
+
+    @web.middleware
+    async def _count(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        return await handler(request)
+
+    @web.middleware
+    async def _delay(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if self.latency or self.jitter:
+            delay = self.random.gauss(self.latency, self.jitter)
+            await asyncio.sleep(max(delay, 0.0) / 1000)
+        return await handler(request)
+
+    @web.middleware
+    async def _flaky(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if self.down or self.random.random() < self.failure_rate:
+            self.failures += 1
+            if self.random.random() < 0.5 and request.transport is not None:
+                request.transport.close()
+            raise web.HTTPServiceUnavailable
+        return await handler(request)
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        if self.fields and (fields := request.query.get("fields")):
+            return web.json_response(select_fields(self.state, fields.split(",")))
+        body = json.dumps(self.state)
+        if not self.etag:
+            return web.Response(text=body, content_type="application/json")
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            text=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    async def handle_set(self, request: web.Request) -> web.Response:
+        self.publish(await request.json())
+        return web.json_response({"status": "ok"})
+
+    async def handle_override(self, request: web.Request) -> web.Response:
+        force = request.query.get("force_heating") == "1"
+        self.model.force_heating = force
+        self.publish({"gas_active": force})
+        return web.json_response({"status": "ok"})
+
+    async def handle_check(self, request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    async def handle_events(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        )
+        await response.prepare(request)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    update = await asyncio.wait_for(queue.get(), timeout=30)
+                except asyncio.TimeoutError:
+                    await response.write(b": keep-alive\n\n")
+                    continue
+                await response.write(f"data: {json.dumps(update)}\n\n".encode())
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _start_model(self, app: web.Application) -> None:
+        app["model"] = asyncio.create_task(self._run_model())
+
+    async def _stop_model(self, app: web.Application) -> None:
+        app["model"].cancel()
+
+    async def _run_model(self) -> None:
+        """Step the thermal model and publish the readings that changed."""
+        while True:
+            await asyncio.sleep(self.tick)
+            if update := self.model.step(self.tick * self.speed):
+                self.publish(update)
+
+
+def main() -> None:
+    """Run the stub gateway."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--no-stream", action="store_true")
+    parser.add_argument("--tick", type=float, default=5.0)
+    parser.add_argument("--extra-keys", type=int, default=0)
+    parser.add_argument("--etag", action="store_true")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-fields", action="store_true")
+    args = parser.parse_args()
+
+    gateway = StubGateway(
+        stream=not args.no_stream,
+        tick=args.tick,
+        extra_keys=args.extra_keys,
+        etag=args.etag,
+        failure_rate=args.failure_rate,
+        speed=args.speed,
+        latency=args.latency,
+        jitter=args.jitter,
+        seed=args.seed,
+        fields=not args.no_fields,
+    )
+    web.run_app(gateway.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
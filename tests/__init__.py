@@ -0,0 +1 @@
+"""Tests for the eBus Glow Worm integration."""
@@ -0,0 +1,41 @@
+"""Fixtures for the eBus Glow Worm tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+import sys
+from typing import Any
+
+from aiohttp import web
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from stub_gateway import StubGateway  # noqa: E402
+
+type StartGateway = Callable[..., Awaitable[tuple[StubGateway, int]]]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+async def start_gateway(socket_enabled: None) -> AsyncIterator[StartGateway]:
+    """Return a function serving a stub gateway on a free local port."""
+    runners: list[web.AppRunner] = []
+
+    async def start(**kwargs: Any) -> tuple[StubGateway, int]:
+        # a long tick keeps the thermal model still unless a test steps it
+        gateway = StubGateway(**{"stream": False, "tick": 3600, **kwargs})
+        runner = web.AppRunner(gateway.app())
+        await runner.setup()
+        runners.append(runner)
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return gateway, runner.addresses[0][1]
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
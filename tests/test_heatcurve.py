@@ -0,0 +1,57 @@
+"""Tests for the heat curve writes."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.ebus_glow_worm.const import (
+    CONF_HEAT_CURVE,
+    DOMAIN,
+    VERIFY_DELAY,
+    WRITE_DEBOUNCE,
+)
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .conftest import StartGateway
+
+
+async def test_optimistic_curve_write_is_sent_once(
+    hass: HomeAssistant, start_gateway: StartGateway
+) -> None:
+    """The optimistic setpoint of a curve write does not start another one."""
+    gateway, port = await start_gateway()
+    # the curve wants 42 degrees flow, half a kelvin more room setpoint
+    gateway.state.update(
+        outside_temp=0.0,
+        target_temperature=20.0,
+        desired_flow_temp=40,
+        inside_temp=19.0,
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_PASSWORD: ""},
+        options={CONF_HEAT_CURVE: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # let the write debounce run out, then the verification read
+    for delay in (WRITE_DEBOUNCE, WRITE_DEBOUNCE + VERIFY_DELAY):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=delay + 1))
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert gateway.requests["/set"] == 1
+    assert gateway.state["target_temperature"] == 20.5
+    assert coordinator.data["target_temperature"] == 20.5
+    assert coordinator.heat_curve.writes == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
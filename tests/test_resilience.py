@@ -0,0 +1,139 @@
+"""Tests for retries, the circuit breaker and stale data against a flaky stub."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ebus_glow_worm import transport
+from custom_components.ebus_glow_worm.const import (
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_THRESHOLD,
+    DEFAULT_STALE_EXPIRY,
+    DOMAIN,
+    RETRY_ATTEMPTS,
+)
+from custom_components.ebus_glow_worm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from custom_components.ebus_glow_worm.transport import GatewayTransport
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    STATE_UNAVAILABLE,
+    Platform,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .conftest import StartGateway
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Retry without sleeping."""
+    monkeypatch.setattr(transport, "backoff_delay", lambda attempt: 0)
+
+
+async def test_retry_then_succeed(start_gateway: StartGateway) -> None:
+    """A transient failure is retried and the request succeeds."""
+    # with this seed the first request fails and the retry gets through
+    gateway, port = await start_gateway(failure_rate=0.5, seed=1)
+    gateway_transport = GatewayTransport(f"http://127.0.0.1:{port}")
+    try:
+        assert await gateway_transport.async_request("GET", "/get")
+    finally:
+        await gateway_transport.async_close()
+
+    assert gateway.failures == 1
+    assert gateway.requests["/get"] == 2
+    assert gateway_transport.metrics.retries == 1
+    assert gateway_transport.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_breaker_opens_probes_and_recovers(
+    start_gateway: StartGateway,
+) -> None:
+    """The breaker opens, fails a probe while down and closes on recovery."""
+    gateway, port = await start_gateway(seed=1)
+    gateway.down = True
+    gateway_transport = GatewayTransport(f"http://127.0.0.1:{port}")
+    breaker = gateway_transport.breaker
+    try:
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(Exception) as err:
+                await gateway_transport.async_request("GET", "/get")
+            assert not isinstance(err.value, CircuitOpenError)
+        # aiohttp may resend once more on a dropped keep-alive connection
+        sent = gateway.requests["/get"]
+        assert sent >= BREAKER_THRESHOLD * RETRY_ATTEMPTS
+        assert gateway_transport.metrics.retries == BREAKER_THRESHOLD * (
+            RETRY_ATTEMPTS - 1
+        )
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.trips == 1
+
+        # open: refused without reaching the gateway
+        with pytest.raises(CircuitOpenError):
+            await gateway_transport.async_request("GET", "/get")
+        assert gateway.requests["/get"] == sent
+
+        # half open while still down: the probe fails and the circuit reopens
+        breaker.opened_at -= BREAKER_RESET_TIMEOUT
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await gateway_transport.async_request("GET", "/get")
+        probes = gateway.requests["/check"]
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # half open after recovery: the probe passes and the request is sent
+        gateway.down = False
+        breaker.opened_at -= BREAKER_RESET_TIMEOUT
+        assert await gateway_transport.async_request("GET", "/get")
+        assert gateway.requests["/check"] == probes + 1
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        await gateway_transport.async_close()
+
+
+async def test_stale_data_until_expiry(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    start_gateway: StartGateway,
+) -> None:
+    """Entities keep the last data through an outage until it expires."""
+    gateway, port = await start_gateway()
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port, CONF_PASSWORD: ""},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = entity_registry.async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{entry.entry_id}-flow_temp"
+    )
+    assert hass.states.get(entity_id).state == "48.0"
+
+    gateway.down = True
+    freezer.tick(timedelta(seconds=DEFAULT_STALE_EXPIRY / 2))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.stale
+    assert coordinator.last_update_success
+    assert hass.states.get(entity_id).state == "48.0"
+
+    freezer.tick(timedelta(seconds=DEFAULT_STALE_EXPIRY / 2))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert not coordinator.last_update_success
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    assert await hass.config_entries.async_unload(entry.entry_id)